@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+History-aware change detection for check_mcp_servers.py.
+This module:
+1. Computes rolling per-server statistics over the history window for all
+   servers in one batched query over the history store's daily aggregates:
+   the mean and standard deviation of the daily pull rate, a recent moving
+   average, and status transitions
+2. Flags pull counts whose growth since the last check has an outlying z-score
+3. Flags servers whose recent moving average of daily pulls drops well below
+   their window average, catching slow declines of large servers
+4. Collapses rapid status oscillation (several transitions within a few
+   hours of raw history) into a single flapping event, suppresses further
+   status changes while a server keeps flapping, and reports the status it
+   settles on once the oscillation stops
+"""
+
+import os
+import math
+import logging
+from datetime import datetime, timedelta
+import history_store
+
+# Constants
+DEFAULT_WINDOW_DAYS = 30
+RECENT_DAYS = 7
+MIN_SAMPLES = 5
+MIN_RECENT_SAMPLES = 3
+MIN_RATE_STD = 1.0
+Z_THRESHOLD = 3.0
+TREND_DROP = 0.5
+FLAP_TRANSITIONS = 4
+FLAP_WINDOW_HOURS = 6
+
+def window_statistics(db, window_days=DEFAULT_WINDOW_DAYS, now=None):
+    """Return rolling statistics for every server in the history window, keyed by server name"""
+    now = now or datetime.now()
+    since = (now - timedelta(days=window_days)).isoformat()
+    recent = (now - timedelta(days=min(RECENT_DAYS, window_days))).isoformat()
+    statistics = {}
+    for server, samples, rate_sum, square_sum, recent_samples, recent_sum, transitions in \
+            history_store.rate_statistics(db, since, recent):
+        mean = rate_sum / samples if samples else 0.0
+        variance = max(0.0, square_sum / samples - mean ** 2) if samples else 0.0
+        statistics[server] = {
+            'samples': samples,
+            'rate_mean': mean,
+            'rate_std': math.sqrt(variance),
+            'recent_samples': recent_samples,
+            'recent_rate_mean': recent_sum / recent_samples if recent_samples else 0.0,
+            'transitions': transitions,
+            'recent_transitions': 0
+        }
+
+    # Flapping is judged on the raw checks of the last few hours, not on the daily aggregates
+    flap_since = (now - timedelta(hours=FLAP_WINDOW_HOURS)).isoformat()
+    for server, transitions in history_store.status_transitions(db, flap_since).items():
+        if server in statistics:
+            statistics[server]['recent_transitions'] = transitions
+    return statistics
+
+def load_statistics(path, window_days=DEFAULT_WINDOW_DAYS):
+    """Read rolling statistics from the history database, or None when it is unavailable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        db = history_store.connect(path)
+        try:
+            statistics = window_statistics(db, window_days)
+        finally:
+            db.close()
+        logging.info(f"Loaded {window_days}-day history statistics for {len(statistics)} servers")
+        return statistics
+    except Exception as e:
+        logging.error(f"Error loading history statistics: {e}")
+        return None
+
+def status_changes(server_name, previous, current, stats):
+    """Return the status change of one server, collapsing rapid oscillation into a flapping event"""
+    # Carried-over results of an incremental run have nothing new to judge
+    if current is previous or current.get('timestamp') == previous.get('timestamp'):
+        return []
+
+    changed = current['status'] != previous['status']
+    transitions = (stats['recent_transitions'] if stats else 0) + int(changed)
+    was_flapping = bool(previous.get('flapping'))
+    current['flapping'] = transitions >= FLAP_TRANSITIONS
+
+    if current['flapping'] and not was_flapping:
+        return [{
+            'server': server_name,
+            'type': 'flapping',
+            'transitions': transitions,
+            'current': current['status']
+        }]
+    if current['flapping']:
+        if changed:
+            logging.debug(f"Suppressed status change of flapping server {server_name} ({transitions} transitions)")
+        return []
+
+    # Once the oscillation stops, always report the status the server settled on
+    if was_flapping:
+        return [{
+            'server': server_name,
+            'type': 'status',
+            'previous': 'flapping',
+            'current': current['status']
+        }]
+    if changed:
+        return [{
+            'server': server_name,
+            'type': 'status',
+            'previous': previous['status'],
+            'current': current['status']
+        }]
+    return []
+
+def pull_count_changes(server_name, previous, current, stats):
+    """Return pull count anomalies of one server, or None when its history is too short to judge"""
+    if not stats or stats['samples'] < MIN_SAMPLES:
+        return None
+
+    # Carried-over results of an incremental run have nothing new to judge
+    if not previous.get('timestamp') or current.get('timestamp') == previous.get('timestamp'):
+        return []
+
+    changes = []
+    elapsed = datetime.fromisoformat(current['timestamp']) - datetime.fromisoformat(previous['timestamp'])
+    days = elapsed.total_seconds() / 86400
+    if days > 0 and previous['pull_count'] > 0 and current['pull_count'] > 0:
+        rate = (current['pull_count'] - previous['pull_count']) / days
+        zscore = (rate - stats['rate_mean']) / max(stats['rate_std'], MIN_RATE_STD)
+        if abs(zscore) >= Z_THRESHOLD:
+            changes.append({
+                'server': server_name,
+                'type': 'pull_count',
+                'previous': previous['pull_count'],
+                'current': current['pull_count'],
+                'percentage': round((current['pull_count'] - previous['pull_count']) / previous['pull_count'] * 100, 2),
+                'zscore': round(zscore, 2)
+            })
+
+    # Report a declining moving average once, when the server enters the decline
+    mean = stats['rate_mean']
+    declining = (stats['recent_samples'] >= MIN_RECENT_SAMPLES and mean > 0
+                 and stats['recent_rate_mean'] < mean * (1 - TREND_DROP))
+    current['trend'] = 'declining' if declining else None
+    if declining and previous.get('trend') != 'declining':
+        changes.append({
+            'server': server_name,
+            'type': 'pull_trend',
+            'previous': round(mean, 1),
+            'current': round(stats['recent_rate_mean'], 1),
+            'percentage': round((stats['recent_rate_mean'] - mean) / mean * 100, 2)
+        })
+    return changes
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Docker Hub and GitHub APIs used by the MCP server scripts.
+This server answers:
+1. GET  /v2/repositories/mcp/?page_size=N&page=P    namespace listing
+2. GET  /v2/repositories/mcp/<name>                 repository details
+3. GET  /v2/repositories/mcp/<name>/tags            tag listing
+4. HEAD /r/mcp/<name>                               repository web page
+5. GET/PUT /repos/<owner>/<repo>/contents/<path>    GitHub contents API
+6. GET/POST/PATCH /repos/<owner>/<repo>/git/...     GitHub git data API (refs,
+   commits and trees with git blob SHAs)
+7. GET  /v2/, GET /token                            registry bearer token challenge
+8. HEAD/GET /v2/mcp/<name>/manifests/<ref>          registry manifests (multi-arch
+   indexes of per-platform manifests) and GET /v2/mcp/<name>/blobs/<digest>
+9. GET  /__stats, POST /__reset                     request counters
+10. POST /__rebuild/<name>                          push a new build of an image
+
+Latency, error rate and 429 rate limiting are configurable, and every request
+is counted per endpoint so benchmarks can report request volume. The GitHub
+files live in a single-branch commit history; `ref_conflicts` makes that many
+ref updates lose a race against a simulated concurrent push. Benchmarks run
+the stand-in in a child process so it does not compete for the measured
+process's GIL.
+
+Usage:
+  python benchmarks/fake_docker_hub.py [--port PORT] [--servers N] [--latency MS]
+"""
+
+import json
+import zlib
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+import multiprocessing
+from collections import Counter
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class FakeHubState:
+    """Repositories, GitHub files, behaviour settings and request counters of the stand-in"""
+
+    def __init__(self, repositories=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=0, rate_window=60.0, seed=0, ref_conflicts=0):
+        self.repositories = repositories or {}
+        self.files = {}
+        self.objects = {}
+        self.refs = {}
+        self.ref_conflicts = ref_conflicts
+        self.builds = Counter()
+        self.images = {}
+        self.tokens = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.lock = threading.RLock()
+        self.window_start = time.time()
+        self.window_count = 0
+
+    def admit(self):
+        """Apply the fixed-window rate limit; return (allowed, remaining, reset epoch)"""
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.rate_window:
+                self.window_start = now
+                self.window_count = 0
+            self.window_count += 1
+            reset = self.window_start + self.rate_window
+            if not self.rate_limit:
+                return True, None, reset
+            remaining = self.rate_limit - self.window_count
+            return remaining >= 0, max(0, remaining), reset
+
+    def delay(self):
+        """Sleep for the configured latency plus random jitter"""
+        with self.lock:
+            extra = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            fail = self.error_rate and self.random.random() < self.error_rate
+        if self.latency or extra:
+            time.sleep(max(0.0, self.latency + extra))
+        return fail
+
+def git_blob_sha(content):
+    """Git blob SHA-1 of a text file"""
+    data = content.encode()
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def _object_sha(kind, body):
+    return hashlib.sha1(f"{kind} {json.dumps(body, sort_keys=True)}".encode()).hexdigest()
+
+PLATFORMS = (('linux', 'amd64'), ('linux', 'arm64'))
+RUNTIME_LAYERS = (('python-runtime', 18000000), ('node-runtime', 45000000))
+BASE_LAYER_SIZE = 29000000
+INDEX_MEDIA_TYPE = 'application/vnd.oci.image.index.v1+json'
+MANIFEST_MEDIA_TYPE = 'application/vnd.oci.image.manifest.v1+json'
+CONFIG_MEDIA_TYPE = 'application/vnd.oci.image.config.v1+json'
+LAYER_MEDIA_TYPE = 'application/vnd.oci.image.layer.v1.tar+gzip'
+
+def _blob(blobs, media_type, body):
+    data = json.dumps(body, sort_keys=True, separators=(',', ':')).encode()
+    digest = 'sha256:' + hashlib.sha256(data).hexdigest()
+    blobs[digest] = (media_type, data)
+    return {'mediaType': media_type, 'digest': digest, 'size': len(data)}
+
+def build_image(name, build):
+    """Build the blobs of one image build: a multi-arch index, per-platform manifests and configs
+
+    Every image shares a base layer per platform and one of two runtime layers;
+    its application layer is unique and grows with every build."""
+    blobs = {}
+    seed = zlib.crc32(name.encode())
+    runtime, runtime_size = RUNTIME_LAYERS[seed % len(RUNTIME_LAYERS)]
+    app_size = 2000000 + (seed % 1000) * 1000 + build * 150000
+    manifests = []
+    for os_name, architecture in PLATFORMS:
+        layers = [
+            (f"base {architecture}", BASE_LAYER_SIZE),
+            (f"{runtime} {architecture}", runtime_size),
+            (f"{name} {build} {architecture}", app_size)
+        ]
+        layer_descriptors = [
+            {'mediaType': LAYER_MEDIA_TYPE, 'digest': 'sha256:' + hashlib.sha256(label.encode()).hexdigest(), 'size': size}
+            for label, size in layers
+        ]
+        config = _blob(blobs, CONFIG_MEDIA_TYPE, {
+            'architecture': architecture, 'os': os_name,
+            'config': {'Labels': {'build': str(build)}},
+            'rootfs': {'type': 'layers', 'diff_ids': [layer['digest'] for layer in layer_descriptors]}
+        })
+        manifest = _blob(blobs, MANIFEST_MEDIA_TYPE, {
+            'schemaVersion': 2, 'mediaType': MANIFEST_MEDIA_TYPE, 'config': config, 'layers': layer_descriptors
+        })
+        manifests.append(dict(manifest, platform={'os': os_name, 'architecture': architecture}))
+        attestation = _blob(blobs, MANIFEST_MEDIA_TYPE, {'schemaVersion': 2, 'mediaType': MANIFEST_MEDIA_TYPE,
+                                                         'config': config, 'layers': [], 'subject': manifest})
+        manifests.append(dict(attestation, platform={'os': 'unknown', 'architecture': 'unknown'},
+                              annotations={'vnd.docker.reference.type': 'attestation-manifest',
+                                           'vnd.docker.reference.digest': manifest['digest']}))
+    index = _blob(blobs, INDEX_MEDIA_TYPE, {'schemaVersion': 2, 'mediaType': INDEX_MEDIA_TYPE, 'manifests': manifests})
+    return {'tags': {'latest': index['digest']}, 'blobs': blobs}
+
+def make_repositories(names, pull_base=1000, last_updated='2025-01-01T00:00:00.000000Z'):
+    """Build repository records for the given names"""
+    return {
+        name: {
+            'name': name,
+            'namespace': 'mcp',
+            'pull_count': pull_base + index * 7,
+            'last_updated': last_updated,
+            'tags': [{'name': 'latest', 'last_updated': last_updated}]
+        }
+        for index, name in enumerate(names)
+    }
+
+class FakeHubHandler(BaseHTTPRequestHandler):
+    """Request handler serving the Docker Hub and GitHub stand-in endpoints"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send_json(self, status, body, headers=None):
+        data = b'' if body is None else json.dumps(body).encode()
+        return self._send_bytes(status, data, 'application/json', headers)
+
+    def _send_bytes(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+        with self.state.lock:
+            self.state.statuses[status] += 1
+
+    def _endpoint(self, parts):
+        if parts[:1] == ['repos']:
+            return 'github_git' if parts[3:4] == ['git'] else 'github_contents'
+        if parts[:2] == ['r', 'mcp']:
+            return 'hub_page'
+        if parts == ['v2']:
+            return 'registry_base'
+        if parts == ['token']:
+            return 'registry_token'
+        if parts[:2] == ['v2', 'mcp'] and len(parts) == 5 and parts[3] in ('manifests', 'blobs'):
+            return 'manifest' if parts[3] == 'manifests' else 'blob'
+        if parts == ['v2', 'repositories', 'mcp']:
+            return 'namespace'
+        if parts[-1:] == ['tags']:
+            return 'tags'
+        return 'repository'
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts in (['__stats'], ['__reset']):
+            return self._stats(parts[0] == '__reset')
+        if parts[:1] == ['__rebuild'] and len(parts) == 2:
+            return self._rebuild(parts[1])
+        endpoint = self._endpoint(parts)
+        with self.state.lock:
+            self.state.requests[endpoint] += 1
+
+        allowed, remaining, reset = self.state.admit()
+        headers = {}
+        if remaining is not None:
+            headers = {
+                'X-RateLimit-Limit': self.state.rate_limit,
+                'X-RateLimit-Remaining': remaining,
+                'X-RateLimit-Reset': int(reset)
+            }
+        if not allowed:
+            headers['Retry-After'] = max(1, int(reset - time.time()))
+            return self._send_json(429, {'message': 'Too Many Requests'}, headers)
+
+        if self.state.delay():
+            return self._send_json(500, {'message': 'Injected failure'}, headers)
+
+        query = parse_qs(url.query)
+        if endpoint == 'github_contents':
+            return self._github_contents(parts, headers)
+        if endpoint == 'github_git':
+            return self._github_git(parts, headers)
+        if endpoint == 'namespace':
+            return self._namespace(url, query, headers)
+        if endpoint.startswith('registry_') or endpoint in ('manifest', 'blob'):
+            return self._registry(endpoint, parts, query, headers)
+
+        name = parts[2] if endpoint == 'hub_page' else parts[3]
+        repository = self.state.repositories.get(name)
+        if repository is None:
+            return self._send_json(404, {'message': 'object not found'}, headers)
+        if endpoint == 'hub_page':
+            return self._send_json(200, None, headers)
+        if endpoint == 'tags':
+            page_size = int(query.get('page_size', ['10'])[0])
+            tags = repository['tags'][:page_size]
+            return self._send_json(200, {'count': len(repository['tags']), 'results': tags}, headers)
+        body = {key: value for key, value in repository.items() if key != 'tags'}
+        return self._send_json(200, body, headers)
+
+    def _stats(self, reset):
+        with self.state.lock:
+            body = {
+                'requests': dict(self.state.requests),
+                'statuses': {str(status): count for status, count in self.state.statuses.items()}
+            }
+            if reset:
+                self.state.requests.clear()
+                self.state.statuses.clear()
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _rebuild(self, name):
+        """Push a new build of an image under the same tag"""
+        with self.state.lock:
+            self.state.builds[name] += 1
+            self.state.images.pop(name, None)
+            repository = self.state.repositories.get(name)
+            if repository is not None:
+                repository['last_updated'] = time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime())
+        return self._send_json(200, {'name': name, 'build': self.state.builds[name]})
+
+    def _challenge(self, scope=None):
+        header = f'Bearer realm="http://{self.headers["Host"]}/token",service="fake-registry"'
+        return {'WWW-Authenticate': header + (f',scope="{scope}"' if scope else '')}
+
+    def _registry(self, endpoint, parts, query, headers):
+        if endpoint == 'registry_base':
+            return self._send_json(401, {'errors': [{'code': 'UNAUTHORIZED'}]}, dict(headers, **self._challenge()))
+        if endpoint == 'registry_token':
+            scopes = {scope.split(':')[1] for scope in query.get('scope', []) if scope.count(':') == 2}
+            token = hashlib.sha256(f"{time.time()} {sorted(scopes)}".encode()).hexdigest()
+            with self.state.lock:
+                self.state.tokens[token] = scopes
+            return self._send_json(200, {'token': token, 'expires_in': 300}, headers)
+
+        name, reference = parts[2], parts[4]
+        authorization = self.headers.get('Authorization', '')
+        with self.state.lock:
+            scopes = self.state.tokens.get(authorization[len('Bearer '):], set())
+        if f"mcp/{name}" not in scopes:
+            scope = f"repository:mcp/{name}:pull"
+            return self._send_json(401, {'errors': [{'code': 'UNAUTHORIZED'}]}, dict(headers, **self._challenge(scope)))
+        if name not in self.state.repositories:
+            return self._send_json(404, {'errors': [{'code': 'NAME_UNKNOWN'}]}, headers)
+
+        with self.state.lock:
+            image = self.state.images.get(name)
+            if image is None:
+                image = self.state.images[name] = build_image(name, self.state.builds[name])
+        digest = image['tags'].get(reference, reference)
+        if digest not in image['blobs']:
+            return self._send_json(404, {'errors': [{'code': 'MANIFEST_UNKNOWN'}]}, headers)
+        media_type, data = image['blobs'][digest]
+        if endpoint == 'manifest' and media_type == CONFIG_MEDIA_TYPE:
+            return self._send_json(404, {'errors': [{'code': 'MANIFEST_UNKNOWN'}]}, headers)
+        return self._send_bytes(200, data, media_type, dict(headers, **{'Docker-Content-Digest': digest}))
+
+    def _namespace(self, url, query, headers):
+        page_size = int(query.get('page_size', ['10'])[0])
+        page = int(query.get('page', ['1'])[0])
+        names = sorted(self.state.repositories)
+        chunk = names[(page - 1) * page_size:page * page_size]
+        next_url = None
+        if page * page_size < len(names):
+            next_url = f"http://{self.headers['Host']}{url.path}?page_size={page_size}&page={page + 1}"
+        results = [
+            {key: value for key, value in self.state.repositories[name].items() if key != 'tags'}
+            for name in chunk
+        ]
+        return self._send_json(200, {'count': len(names), 'next': next_url, 'results': results}, headers)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _store(self, kind, body):
+        """Store a git object and return its SHA (lock held by the caller)"""
+        sha = git_blob_sha(body) if kind == 'blob' else _object_sha(kind, body)
+        self.state.objects[sha] = (kind, body)
+        return sha
+
+    def _head(self, branch='main'):
+        """Return the branch head, creating an initial commit of the seeded files (lock held by the caller)"""
+        if not self.state.refs:
+            blobs = {}
+            for path, content in self.state.files.items():
+                blobs[path] = self._store('blob', content)
+            tree = self._store('tree', blobs)
+            self.state.refs['main'] = self._store('commit', {'tree': tree, 'parents': [], 'message': 'Initial commit'})
+        return self.state.refs.get(branch)
+
+    def _advance(self, branch, commit):
+        """Point the branch at a commit and check its files out (lock held by the caller)"""
+        self.state.refs[branch] = commit
+        tree = self.state.objects[self.state.objects[commit][1]['tree']][1]
+        self.state.files = {path: self.state.objects[sha][1] for path, sha in tree.items()}
+
+    def _commit_files(self, branch, changes, message):
+        """Commit changed files on top of the branch head (lock held by the caller)"""
+        head = self._head(branch)
+        tree = dict(self.state.objects[self.state.objects[head][1]['tree']][1])
+        for path, content in changes.items():
+            tree[path] = self._store('blob', content)
+        commit = self._store('commit', {'tree': self._store('tree', tree), 'parents': [head], 'message': message})
+        self._advance(branch, commit)
+        return commit
+
+    def _github_contents(self, parts, headers):
+        path = '/'.join(parts[4:])
+        if self.command == 'GET':
+            content = self.state.files.get(path, '')
+            body = {'path': path, 'sha': git_blob_sha(content), 'content': base64.b64encode(content.encode()).decode()}
+            return self._send_json(200, body, headers)
+
+        payload = self._read_json()
+        with self.state.lock:
+            current = self.state.files.get(path, '')
+            if payload.get('sha') != git_blob_sha(current):
+                return self._send_json(409, {'message': 'sha does not match'}, headers)
+            content = base64.b64decode(payload.get('content', '')).decode()
+            self._commit_files(payload.get('branch', 'main'), {path: content}, payload.get('message', ''))
+        return self._send_json(200, {'content': {'path': path, 'sha': git_blob_sha(content)}}, headers)
+
+    def _github_git(self, parts, headers):
+        kind, rest = parts[4:5], parts[5:]
+        payload = self._read_json() if self.command in ('POST', 'PATCH') else {}
+        with self.state.lock:
+            self._head()
+            if kind in (['ref'], ['refs']) and rest[:1] == ['heads']:
+                branch = '/'.join(rest[1:])
+                head = self.state.refs.get(branch)
+                if head is None:
+                    return self._send_json(404, {'message': 'Not Found'}, headers)
+                if self.command == 'PATCH':
+                    return self._update_ref(branch, head, payload, headers)
+                return self._send_json(200, {'ref': f'refs/heads/{branch}', 'object': {'type': 'commit', 'sha': head}}, headers)
+
+            if kind == ['commits'] and self.command == 'POST':
+                if payload.get('tree') not in self.state.objects:
+                    return self._send_json(422, {'message': 'Tree SHA does not exist'}, headers)
+                sha = self._store('commit', {'tree': payload['tree'], 'parents': payload.get('parents', []),
+                                             'message': payload.get('message', '')})
+                return self._send_json(201, {'sha': sha, 'tree': {'sha': payload['tree']}}, headers)
+
+            if kind == ['trees'] and self.command == 'POST':
+                base = self.state.objects.get(payload.get('base_tree'), (None, {}))[1]
+                tree = dict(base)
+                for entry in payload.get('tree', []):
+                    if entry.get('sha', '') is None:
+                        tree.pop(entry['path'], None)
+                    else:
+                        tree[entry['path']] = entry.get('sha') or self._store('blob', entry['content'])
+                return self._send_json(201, {'sha': self._store('tree', tree)}, headers)
+
+            stored = self.state.objects.get(rest[0]) if rest else None
+            if kind == ['commits'] and stored and stored[0] == 'commit':
+                body = stored[1]
+                return self._send_json(200, {'sha': rest[0], 'tree': {'sha': body['tree']}, 'message': body['message'],
+                                             'parents': [{'sha': parent} for parent in body['parents']]}, headers)
+            if kind == ['trees'] and stored and stored[0] == 'tree':
+                entries = [{'path': path, 'mode': '100644', 'type': 'blob', 'sha': sha} for path, sha in sorted(stored[1].items())]
+                return self._send_json(200, {'sha': rest[0], 'tree': entries, 'truncated': False}, headers)
+        return self._send_json(404, {'message': 'Not Found'}, headers)
+
+    def _update_ref(self, branch, head, payload, headers):
+        """Fast-forward a branch, first losing any configured races to a concurrent push (lock held)"""
+        if self.state.ref_conflicts > 0:
+            self.state.ref_conflicts -= 1
+            head = self._commit_files(branch, {'CONCURRENT.md': f'concurrent push {self.state.ref_conflicts}\n'},
+                                      'Concurrent push')
+        commit = self.state.objects.get(payload.get('sha'))
+        if commit is None or commit[0] != 'commit':
+            return self._send_json(422, {'message': 'Object does not exist'}, headers)
+        if head not in commit[1]['parents'] and not payload.get('force'):
+            return self._send_json(422, {'message': 'Update is not a fast forward'}, headers)
+        self._advance(branch, payload['sha'])
+        return self._send_json(200, {'ref': f'refs/heads/{branch}', 'object': {'type': 'commit', 'sha': payload['sha']}}, headers)
+
+    do_GET = _handle
+    do_HEAD = _handle
+    do_PUT = _handle
+    do_POST = _handle
+    do_PATCH = _handle
+
+class FakeHubServer(ThreadingHTTPServer):
+    """Threaded HTTP server that carries a FakeHubState"""
+
+    daemon_threads = True
+
+    def __init__(self, state, host='127.0.0.1', port=0):
+        super().__init__((host, port), FakeHubHandler)
+        self.state = state
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        """Serve requests on a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+
+def _serve(repositories, files, options, queue):
+    """Child process entry point: build the state, report the URL and serve forever"""
+    state = FakeHubState(repositories, **options)
+    state.files.update(files)
+    server = FakeHubServer(state)
+    queue.put(server.base_url)
+    server.serve_forever()
+
+def start_process(repositories, files=None, **options):
+    """Run the stand-in in a child process; return (process, base URL)"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(repositories, files or {}, options, queue), daemon=True)
+    process.start()
+    return process, queue.get(timeout=30)
+
+def main():
+    """Run the stand-in in the foreground"""
+    parser = argparse.ArgumentParser(description='Local stand-in for the Docker Hub and GitHub APIs')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--servers', type=int, default=100, help='Number of synthetic repositories')
+    parser.add_argument('--latency', type=float, default=0.0, help='Per-request latency in milliseconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests allowed per 60 second window (0: unlimited)')
+    args = parser.parse_args()
+
+    names = [f"server-{index}" for index in range(1, args.servers + 1)]
+    state = FakeHubState(make_repositories(names), args.latency / 1000, error_rate=args.error_rate,
+                         rate_limit=args.rate_limit)
+    server = FakeHubServer(state, port=args.port)
+    print(f"Serving fake Docker Hub on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
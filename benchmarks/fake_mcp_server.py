@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an MCP server speaking JSON-RPC over stdio.
+This server answers:
+1. initialize                  after the configured startup delay, with its
+                               serverInfo and capabilities
+2. notifications/initialized   silently
+3. tools/list                  the configured number of tools
+4. anything else               a JSON-RPC "method not found" error
+
+Before answering initialize it writes a log notification and a non-JSON line,
+as real servers often do, so probes must skip both. The behaviour of each
+server name can be set in a JSON config file ({name: {"startup_delay": S,
+"mode": "ok" | "exit" | "hang" | "error", "tools": N}}), which is re-read on
+every launch so a test can make a server slow or broken between two runs.
+
+Usage:
+  python benchmarks/fake_mcp_server.py --name NAME [--startup-delay S] [--tools N] [--config FILE]
+"""
+
+import sys
+import json
+import time
+import argparse
+
+def load_behaviour(args):
+    """Return this server's behaviour, the command line defaults overridden by the config file"""
+    behaviour = {'startup_delay': args.startup_delay, 'mode': args.mode, 'tools': args.tools}
+    if args.config:
+        try:
+            with open(args.config, 'r', encoding='utf-8') as file:
+                behaviour.update(json.load(file).get(args.name, {}))
+        except FileNotFoundError:
+            pass
+    return behaviour
+
+def send(message):
+    sys.stdout.write(json.dumps(message) + '\n')
+    sys.stdout.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake stdio MCP server')
+    parser.add_argument('--name', default='fake')
+    parser.add_argument('--startup-delay', type=float, default=0.0)
+    parser.add_argument('--mode', choices=['ok', 'exit', 'hang', 'error'], default='ok')
+    parser.add_argument('--tools', type=int, default=3)
+    parser.add_argument('--config', metavar='FILE')
+    args = parser.parse_args()
+    behaviour = load_behaviour(args)
+
+    if behaviour['mode'] == 'exit':
+        sys.exit(1)
+    time.sleep(behaviour['startup_delay'])
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        method = request.get('method')
+        if 'id' not in request:
+            continue
+        if behaviour['mode'] == 'hang':
+            continue
+
+        if method == 'initialize' and behaviour['mode'] == 'ok':
+            send({'jsonrpc': '2.0', 'method': 'notifications/message',
+                  'params': {'level': 'info', 'data': f'{args.name} starting'}})
+            sys.stdout.write(f'{args.name} listening on stdio\n')
+            send({'jsonrpc': '2.0', 'id': request['id'], 'result': {
+                'protocolVersion': request.get('params', {}).get('protocolVersion'),
+                'capabilities': {'tools': {}},
+                'serverInfo': {'name': args.name, 'version': '1.0.0'}
+            }})
+        elif method == 'tools/list':
+            send({'jsonrpc': '2.0', 'id': request['id'], 'result': {'tools': [
+                {'name': f'{args.name}_tool_{index}', 'description': f'Tool {index}',
+                 'inputSchema': {'type': 'object', 'properties': {}}}
+                for index in range(behaviour['tools'])
+            ]}})
+        elif behaviour['mode'] == 'error':
+            send({'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32603, 'message': 'Internal error'}})
+        else:
+            send({'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32601, 'message': f'Method not found: {method}'}})
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the MCP server scripts.
+This script:
+1. Starts the local Docker Hub / GitHub stand-in from fake_docker_hub.py
+2. Generates synthetic READMEs with 100, 1k and 10k server rows
+3. Runs check_mcp_servers.main and update_pull_counts.main end to end against it,
+   timing every run and each of its phases
+4. Writes the results as JSON so throughput and latency can be tracked over time
+
+Usage:
+  python benchmarks/run_benchmarks.py [--sizes 100,1000,10000] [--latency MS] [--output FILE]
+
+Options:
+  --sizes LIST        Comma-separated README sizes [default: 100,1000,10000]
+  --latency MS        Simulated per-request latency [default: 20]
+  --error-rate RATE   Fraction of requests answered with HTTP 500 [default: 0]
+  --rate-limit N      Requests per 60 second window before 429s (0: unlimited) [default: 0]
+  --missing-rate R    Fraction of README servers absent from the fake namespace [default: 0]
+  --output FILE       JSON results file [default: benchmark_results.json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from fake_docker_hub import make_repositories, start_process  # noqa: E402
+
+# Constants
+DEFAULT_SIZES = '100,1000,10000'
+DEFAULT_OUTPUT = 'benchmark_results.json'
+CATALOG_PHASES = [
+    'read_readme', 'extract_server_list', 'fetch_catalog', 'update_readme_with_pull_counts', 'write_readme'
+]
+CHECK_PHASES = [
+    'load_previous_status', 'check_servers', 'detect_changes', 'write_report', 'save_status', 'record_history'
+]
+UPDATE_PHASES = ['fetch_pull_counts', 'commit_and_push_changes']
+SCENARIOS = [
+    ('check', ['--bulk', '--concurrency', '16', '--rate', '100000', '--no-cache', '--output', 'json']),
+    ('check-digests', ['--bulk', '--digests', '--concurrency', '16', '--rate', '100000', '--no-cache', '--output', 'json']),
+    ('check-incremental', ['--bulk', '--incremental', '--concurrency', '16', '--rate', '100000',
+                           '--no-cache', '--output', 'json']),
+    ('update', ['--bulk', '--concurrency', '16', '--rate', '100000', '--no-cache', '--commit'])
+]
+
+def generate_readme(size):
+    """Build a README with `size` server table rows, returning (content, server names)"""
+    names = [f"server-{index}" for index in range(1, size + 1)]
+    lines = [
+        "# A Curated List of Docker MCP Servers",
+        "",
+        f"There are currently {size} MCP servers available:",
+        "",
+        "| # | MCP Server | Description | Docker Hub Pulls | Link |",
+        "|---|------------|-------------|------------------|------|"
+    ]
+    for index, name in enumerate(names, 1):
+        lines.append(f"| {index} | {name} | Synthetic benchmark server {index} | TBD | [GitHub](https://example.com/{name}.md) |")
+    lines.append("")
+    return "\n".join(lines), names
+
+class PhaseTimer:
+    """Wraps module functions so every call adds to a per-phase duration"""
+
+    def __init__(self):
+        self.durations = {}
+        self.calls = {}
+        self.originals = []
+
+    def wrap(self, module, names):
+        for name in names:
+            original = getattr(module, name, None)
+            if original is None:
+                continue
+            self.originals.append((module, name, original))
+            setattr(module, name, self._timed(name, original))
+
+    def _timed(self, name, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+                self.calls[name] = self.calls.get(name, 0) + 1
+        return timed
+
+    def restore(self):
+        for module, name, original in reversed(self.originals):
+            setattr(module, name, original)
+        self.originals = []
+
+def run_scenario(scenario, argv, size, args):
+    """Run one script end to end against a fresh stand-in and README"""
+    import http_client
+    import catalog
+    import check_mcp_servers
+    import update_pull_counts
+
+    readme, names = generate_readme(size)
+    missing_every = int(1 / args.missing_rate) if args.missing_rate else 0
+    listed = [name for index, name in enumerate(names, 1) if not missing_every or index % missing_every]
+    process, base_url = start_process(
+        make_repositories(listed), {'README.md': readme}, latency=args.latency / 1000,
+        jitter=args.jitter / 1000, error_rate=args.error_rate, rate_limit=args.rate_limit
+    )
+
+    workdir = tempfile.mkdtemp(prefix=f"bench-{scenario}-{size}-")
+    previous_cwd = os.getcwd()
+    timer = PhaseTimer()
+    try:
+        os.chdir(workdir)
+        with open('README.md', 'w', encoding='utf-8') as file:
+            file.write(readme)
+
+        check_mcp_servers.DOCKER_HUB_API_URL = f"{base_url}/v2/repositories/mcp/"
+        check_mcp_servers.REGISTRY_URL = base_url
+        update_pull_counts.DOCKER_HUB_API_URL = f"{base_url}/v2/repositories/mcp/"
+        update_pull_counts.GITHUB_REPO_URL = f"{base_url}/repos/example/awesome-docker-mcp-servers"
+        update_pull_counts.GITHUB_TOKEN = 'benchmark-token'
+        http_client.close_sessions()
+
+        if scenario == 'update':
+            module, phases = update_pull_counts, UPDATE_PHASES
+        else:
+            module, phases = check_mcp_servers, CHECK_PHASES
+        timer.wrap(catalog, CATALOG_PHASES)
+        timer.wrap(module, phases)
+
+        def run_once():
+            sys.argv = [module.__name__ + '.py'] + argv
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.main()
+
+        if scenario == 'check-incremental':
+            # A warm-up run seeds the schedule so the timed run only checks servers that are due
+            run_once()
+            timer.durations.clear()
+            timer.calls.clear()
+            http_client.post(f"{base_url}/__reset")
+
+        start = time.perf_counter()
+        run_once()
+        total = time.perf_counter() - start
+        stats = http_client.get(f"{base_url}/__stats", use_cache=False).json()
+    finally:
+        timer.restore()
+        os.chdir(previous_cwd)
+        process.terminate()
+        process.join()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'scenario': scenario,
+        'rows': size,
+        'total_seconds': round(total, 4),
+        'rows_per_second': round(size / total, 1) if total else None,
+        'phases': {name: round(duration, 4) for name, duration in timer.durations.items()},
+        'phase_calls': dict(timer.calls),
+        'requests': stats['requests'],
+        'request_total': sum(stats['requests'].values()),
+        'statuses': stats['statuses']
+    }
+
+def main():
+    """Run every scenario at every size and write the JSON results"""
+    parser = argparse.ArgumentParser(description='Benchmark the MCP server scripts against a local fake Docker Hub')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Comma-separated README sizes (default: {DEFAULT_SIZES})')
+    parser.add_argument('--scenarios', default=','.join(name for name, _ in SCENARIOS),
+                        help='Comma-separated scenarios to run')
+    parser.add_argument('--latency', type=float, default=20.0, help='Simulated per-request latency in ms (default: 20)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random latency jitter in ms (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests per 60 second window (0: unlimited)')
+    parser.add_argument('--missing-rate', type=float, default=0.0,
+                        help='Fraction of README servers absent from the fake namespace (default: 0)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'JSON results file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--verbose', action='store_true', help='Keep the scripts\' INFO logging enabled')
+    args = parser.parse_args()
+
+    # Import the scripts from a scratch directory so their log files do not land in the repo
+    scratch = tempfile.mkdtemp(prefix='bench-logs-')
+    previous_cwd = os.getcwd()
+    os.chdir(scratch)
+    try:
+        import check_mcp_servers  # noqa: F401
+        import update_pull_counts  # noqa: F401
+    finally:
+        os.chdir(previous_cwd)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    selected = [scenario for scenario in SCENARIOS if scenario[0] in args.scenarios.split(',')]
+    results = []
+    for size in sizes:
+        for scenario, argv in selected:
+            result = run_scenario(scenario, argv, size, args)
+            results.append(result)
+            print(f"{scenario:>18} {size:>6} rows: {result['total_seconds']:8.3f}s "
+                  f"{result['request_total']:>6} requests", file=sys.stderr)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'latency_ms': args.latency,
+            'jitter_ms': args.jitter,
+            'error_rate': args.error_rate,
+            'rate_limit': args.rate_limit,
+            'missing_rate': args.missing_rate
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Benchmark results written to {args.output}", file=sys.stderr)
+    shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Record/replay layer for the HTTP calls of the MCP server scripts.
+This module:
+1. Records every response (status, relevant headers and body) to a compact,
+   gzip-compressed JSON cassette keyed by method and URL
+2. Replays a cassette without any network access, optionally adding a
+   simulated latency per request
+3. Serves repeated requests for the same URL in recorded order, repeating the
+   last recording once they run out
+
+Cassettes store every requested URL, including webhook URLs used for
+notifications, so do not share cassettes recorded with --notify.
+"""
+
+import os
+import gzip
+import json
+import time
+import base64
+import logging
+import tempfile
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Constants
+CASSETTE_VERSION = 1
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'retry-after', 'link')
+KEPT_HEADER_PREFIXES = ('x-ratelimit-',)
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode for a request that is not in the cassette"""
+
+def _kept_headers(headers):
+    return {
+        key: value for key, value in headers.items()
+        if key.lower() in KEPT_HEADERS or key.lower().startswith(KEPT_HEADER_PREFIXES)
+    }
+
+class Cassette:
+    """Recorded HTTP interactions, either being recorded or replayed"""
+
+    def __init__(self, path, mode='replay', latency=0.0):
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions = {}
+        self.positions = {}
+        self.stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+        self.lock = threading.Lock()
+        if mode == 'replay':
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {path}: {data.get('version')}")
+            self.interactions = data['interactions']
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def record(self, method, url, response):
+        """Store one live response"""
+        body = response.content or b''
+        try:
+            entry = {'status': response.status_code, 'headers': _kept_headers(response.headers), 'body': body.decode('utf-8')}
+        except UnicodeDecodeError:
+            entry = {'status': response.status_code, 'headers': _kept_headers(response.headers),
+                     'body_base64': base64.b64encode(body).decode('ascii')}
+        with self.lock:
+            self.interactions.setdefault(f"{method} {url}", []).append(entry)
+            self.stats['recorded'] += 1
+
+    def replay(self, method, url):
+        """Return the next recorded response for this request"""
+        key = f"{method} {url}"
+        with self.lock:
+            entries = self.interactions.get(key)
+            if not entries:
+                self.stats['missed'] += 1
+                raise CassetteMiss(f"No recorded response for {key}")
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+            self.stats['replayed'] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        if 'body_base64' in entry:
+            response._content = base64.b64decode(entry['body_base64'])
+        else:
+            response._content = entry['body'].encode('utf-8')
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def close(self):
+        """Write a recorded cassette atomically and log the counts"""
+        if self.mode == 'record':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(prefix='.cassette.', dir=directory)
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as file:
+                payload = {'version': CASSETTE_VERSION, 'interactions': self.interactions}
+                file.write(json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+            os.replace(temp_path, self.path)
+            logging.info(f"Recorded {self.stats['recorded']} responses to {self.path}")
+        else:
+            logging.info(f"Replayed {self.stats['replayed']} responses from {self.path}, {self.stats['missed']} missing")
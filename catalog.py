@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Catalog engine shared by the MCP server scripts.
+This module:
+1. Reads README.md and parses its server table
+2. Fetches every Docker Hub repository of the catalog once per run, from the
+   paginated namespace listing and/or one concurrent API request per server,
+   plus the latest tag of repositories that changed since the last run, judged
+   by their last update time or by the registry manifest digests of the
+   tracked tags
+3. Returns a single result set keyed by server name from which the health
+   report, the status file and the README pull counts are all derived
+"""
+
+import re
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import docker_hub
+import http_client
+import log_setup
+import metrics
+import readme_table
+
+# Constants
+README_PATH = 'README.md'
+DOCKER_HUB_API_URL = 'https://hub.docker.com/v2/repositories/mcp/'
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0
+TAGS_PAGE_SIZE = 1
+UNAVAILABLE_PULL_COUNT = "TBD (unavailable)"
+
+def read_readme(path=README_PATH):
+    """Read the README.md file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read()
+    except FileNotFoundError:
+        logging.error(f"README file not found at {path}")
+        raise
+
+def extract_server_list(readme_content):
+    """Extract the server list from the README.md content"""
+    # First check how many servers are listed in the README
+    match = re.search(r'There are currently (\d+) MCP servers available:', readme_content)
+    expected_count = int(match.group(1)) if match else 0
+
+    if expected_count > 0:
+        logging.info(f"README mentions {expected_count} MCP servers")
+
+    # Walk the README once, recording each table row's span and cells
+    servers = readme_table.parse_table_rows(readme_content)
+
+    # Verify if we found all servers
+    found_count = len(servers)
+    logging.info(f"Found {found_count} servers in README.md table")
+
+    if expected_count > 0 and found_count < expected_count:
+        logging.warning(f"Expected {expected_count} servers but only found {found_count}")
+        logging.warning("Some servers might be missing from the table or in a different format")
+
+    return servers
+
+def find_all_mcp_servers(readme_content):
+    """Find all MCP servers mentioned in the README, even those not in the main table"""
+    # Servers listed outside the main table would be added here once the README lists any
+    all_servers = extract_server_list(readme_content)
+
+    # Keep the first row of every server name
+    server_names = set()
+    unique_servers = []
+    for server in all_servers:
+        if server['server_name'] not in server_names:
+            server_names.add(server['server_name'])
+            unique_servers.append(server)
+
+    logging.info(f"Found a total of {len(unique_servers)} unique MCP servers")
+    return unique_servers
+
+def check_server(server_name, limiter=None, repository=None, previous=None, api_url=DOCKER_HUB_API_URL,
+                 versions=True, registry=None):
+    """Check if a server is available on Docker Hub and get its details"""
+    server_name = server_name.strip()
+    result = {
+        'name': server_name,
+        'available': False,
+        'last_updated': None,
+        'status': 'unknown',
+        'version': None,
+        'pull_count': 0,
+        'timestamp': datetime.now().isoformat()
+    }
+
+    try:
+        # Check if server exists on Docker Hub, unless the namespace listing already told us
+        if repository is None:
+            url = f"{api_url}{server_name}"
+            log_setup.request_log.info("Checking server %s at %s", server_name, url)
+
+            response = http_client.get(url, limiter=limiter)
+            if response.status_code != 200:
+                # Only a missing repository is an outage; failures that outlasted the retries are errors
+                result['status'] = 'offline' if response.status_code == 404 else 'error'
+                log_setup.request_log.warning("Server %s returned status code %s", server_name, response.status_code)
+                return result
+            repository = response.json()
+
+        result['available'] = True
+        result['last_updated'] = repository.get('last_updated')
+        result['pull_count'] = repository.get('pull_count', 0)
+        result['status'] = 'online'
+
+        # Track the manifest digests of the tracked tags with HEAD requests, and only read the tag
+        # listing for a server seen for the first time or whose images were rebuilt
+        if registry is not None:
+            earlier = (previous or {}).get('digests') or {}
+            result['digests'] = registry.digests(server_name, earlier, limiter)
+            unchanged = ({tag: entry['digest'] for tag, entry in result['digests'].items()}
+                         == {tag: entry['digest'] for tag, entry in earlier.items()})
+            if previous and previous.get('version') is not None and unchanged:
+                result['version'] = previous['version']
+                return result
+
+        # Reuse the previous version when the repository has not changed since the last run
+        elif (previous and previous.get('version') is not None
+                and previous.get('last_updated') == result['last_updated']):
+            result['version'] = previous['version']
+            return result
+        if not versions:
+            return result
+
+        # Get latest tag/version info from a small page ordered by last update
+        tags_url = f"{api_url}{server_name}/tags?page_size={TAGS_PAGE_SIZE}&ordering=last_updated"
+        tags_response = http_client.get(tags_url, limiter=limiter)
+        if tags_response.status_code == 200:
+            tags_data = tags_response.json()
+            if tags_data.get('results'):
+                result['version'] = tags_data['results'][0].get('name')
+    except Exception as e:
+        result['status'] = 'error'
+        logging.error(f"Error checking server {server_name}: {e}")
+
+    return result
+
+async def check_servers_async(server_names, concurrency=DEFAULT_CONCURRENCY, limiter=None, repositories=None,
+                              previous_status=None, api_url=DOCKER_HUB_API_URL, versions=True, registry=None):
+    """Check servers with at most `concurrency` requests in flight, preserving input order"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    repositories = repositories or {}
+    previous_status = previous_status or {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def check(server_name):
+            async with semaphore:
+                return await loop.run_in_executor(
+                    executor, check_server, server_name, limiter, repositories.get(server_name),
+                    previous_status.get(server_name), api_url, versions, registry
+                )
+
+        return await asyncio.gather(*(check(name) for name in server_names))
+
+def list_repositories(api_url=DOCKER_HUB_API_URL, rate=DEFAULT_RATE):
+    """Fetch the paginated namespace listing, or None if it fails"""
+    with metrics.phase('namespace_listing'):
+        return docker_hub.list_namespace_repositories(api_url, http_client.TokenBucket(rate))
+
+def fetch_catalog(servers, api_url=DOCKER_HUB_API_URL, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                  bulk=False, previous_status=None, catalog=None, versions=True, registry=None, repositories=None):
+    """Fetch every server's repository once and return the results keyed by server name, failures included"""
+    limiter = http_client.TokenBucket(rate)
+    server_names = [server['server_name'] for server in servers]
+
+    # In bulk mode one paginated namespace listing (unless the caller already has it) replaces the
+    # per-server repository calls; servers missing from the listing still get an individual request
+    if not bulk:
+        repositories = None
+    elif servers:
+        if repositories is None:
+            with metrics.phase('namespace_listing'):
+                repositories = docker_hub.list_namespace_repositories(api_url, limiter)
+        if repositories is None:
+            logging.warning("Falling back to per-server repository checks")
+        else:
+            listed, missing, _ = docker_hub.join_servers(servers, repositories, catalog)
+            logging.info(f"{len(listed)} servers found in namespace listing, {len(missing)} checked individually")
+
+    # Request registry tokens for many repositories at once rather than one per worker
+    if registry is not None and server_names:
+        with metrics.phase('registry_auth'):
+            registry.authorize(server_names)
+
+    results = asyncio.run(check_servers_async(
+        server_names, max(1, concurrency), limiter, repositories, previous_status, api_url, versions, registry
+    ))
+    return dict(zip(server_names, results))
+
+def pull_count_cell(result, current):
+    """README pull count cell for a fetch result, keeping `current` when Docker Hub could not answer"""
+    if result is None or result['status'] in ('error', 'unknown'):
+        return current
+    if result['status'] == 'offline':
+        return UNAVAILABLE_PULL_COUNT
+    return f"{result['pull_count']:,}"
+
+def apply_pull_counts(servers, status):
+    """Set `new_pull_count` on each parsed README row from a result set"""
+    for server in servers:
+        server['new_pull_count'] = pull_count_cell(status.get(server['server_name']), server['pull_count'])
+
+def apply_listing(status, repositories):
+    """Overlay a namespace listing's pull counts on a result set, covering servers not checked this run"""
+    status = dict(status)
+    for name, repository in repositories.items():
+        status[name] = dict(status.get(name) or {}, status='online', pull_count=repository.get('pull_count', 0))
+    return status
+
+def update_readme_with_pull_counts(readme_content, servers):
+    """Update the README.md with the latest pull counts"""
+    replacements = []
+
+    for server in servers:
+        if server['pull_count'] != server.get('new_pull_count', server['pull_count']):
+            # Create the new line with updated pull count
+            new_line = readme_table.format_row(
+                server['index'],
+                server['server_name'],
+                server['description'],
+                server['new_pull_count'],
+                server['link']
+            )
+
+            # Replace exactly this row's span, not every identical line
+            replacements.append((server['span'], new_line))
+            log_setup.request_log.info("Updated pull count for %s: %s ? %s", server['server_name'], server['pull_count'],
+                                       server['new_pull_count'])
+
+    # Rebuild the document once from all replaced spans
+    return readme_table.splice_rows(readme_content, replacements)
+
+def write_readme(content, previous=None, path=README_PATH):
+    """Write the updated content back to README.md unless it is unchanged"""
+    if content == previous:
+        logging.info(f"{path} is unchanged, not rewriting it")
+        return False
+    try:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        logging.info(f"Successfully updated {path}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to write to {path}: {e}")
+        raise
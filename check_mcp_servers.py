@@ -4,144 +4,135 @@ Script to check the availability and status of Docker MCP servers.
 This script:
 1. Reads the server list from README.md
 2. Checks if each server is available on Docker Hub
-3. Monitors server health, version, and updates
+3. Monitors server health, version, and updates (optionally by registry manifest digest)
 4. Generates a health report
+5. Optionally probes each online server with the MCP handshake and tracks its cold start
+6. Optionally updates the README pull counts from the same results
 
 Usage:
-  python check_mcp_servers.py [--output FORMAT] [--notify]
+  python check_mcp_servers.py [--output FORMAT] [--notify] [--concurrency N] [--rate RPS] [--bulk] [--incremental] [--daemon]
+  python check_mcp_servers.py --shard I/N [options]
+  python check_mcp_servers.py --merge PARTIAL... [options]
 
 Options:
-  --output FORMAT    Output format (text, json, markdown) [default: markdown]
-  --notify           Send notification on status changes
+  --output FORMAT    Output format (text, json, markdown, csv, html) [default: markdown]
+  --report FMT:PATH  Also write the report to PATH in FMT; may be repeated
+  --notify           Send notification on status changes (delivered in the background as a digest)
+  --update-readme    Update the README pull counts from the same results (no second fetch)
+  --commit           Commit the status, schedule, report and README files to GitHub as one commit
+  --concurrency N    Number of servers checked in parallel [default: 8]
+  --rate RPS         Maximum Docker Hub requests per second [default: 5]
+  --bulk             Use the paginated namespace listing instead of one request per server
+  --digests          Detect rebuilt images from registry manifest digests instead of the tag listing
+  --analyze-images   Add image sizes, shared layers and size regressions to the report
+  --probe            Launch each online server and time its MCP initialize + tools/list handshake
+  --probe-command T  Command template of the probe, with {name}, {image} and {container}
+                     [default: docker run -i --rm --pull=never --name {container} {image}]
+  --incremental      Only check servers that are due according to their adaptive schedule
+  --daemon           Keep running and serve /status, /changes and /metrics on a local port
+  --shard I/N        Only check shard I of N and write its partial results
+  --merge FILE...    Combine all shards' partial results into one status file, report and notification
+  --log-file PATH    JSON-lines log file, rotated by size [default: server_check.log]
+  --log-sample L=R   Keep only fraction R of the per-request messages at level L
 """
 
+import io
 import os
-import re
-import json
+import sys
 import time
 import argparse
-import requests
+import contextlib
+import anomaly
+import catalog
+import github_publisher
+import history_store
+import http_client
+import image_analysis
+import log_setup
+import mcp_probe
+import metrics
+import notifier
+import registry
+import report_renderer
+import scheduler
+import sharding
+import status_server
+import status_store
 from datetime import datetime
 import logging
-from tabulate import tabulate
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='server_check.log',
-    filemode='a'
-)
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console.setFormatter(formatter)
-logging.getLogger('').addHandler(console)
 
 # Constants
-README_PATH = 'README.md'
-DOCKER_HUB_API_URL = 'https://hub.docker.com/v2/repositories/mcp/'
-SERVER_STATUS_FILE = 'server_status.json'
-TABLE_PATTERN = r'\|\s*(\d+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|'
+README_PATH = catalog.README_PATH
+DOCKER_HUB_API_URL = catalog.DOCKER_HUB_API_URL
+REGISTRY_URL = registry.REGISTRY_URL
+SERVER_STATUS_FILE = status_store.STATUS_FILE
+LEGACY_STATUS_FILE = status_store.LEGACY_STATUS_FILE
 NOTIFICATION_EMAIL = os.environ.get('NOTIFICATION_EMAIL')
 SLACK_WEBHOOK = os.environ.get('SLACK_WEBHOOK')
+GITHUB_REPO_URL = 'https://api.github.com/repos/ajeetraina/awesome-docker-mcp-servers'
+GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
+GITHUB_BRANCH = os.environ.get('GITHUB_BRANCH', github_publisher.DEFAULT_BRANCH)
+DEFAULT_CONCURRENCY = catalog.DEFAULT_CONCURRENCY
+DEFAULT_RATE = catalog.DEFAULT_RATE
+DEFAULT_DAEMON_INTERVAL = 900
+SHARD_PREFIX = 'server_status'
+LOG_FILE = 'server_check.log'
+DEFAULT_NOTIFY_TIMEOUT = 120
 
-def read_readme():
-    """Read the README.md file"""
-    try:
-        with open(README_PATH, 'r', encoding='utf-8') as file:
-            return file.read()
-    except FileNotFoundError:
-        logging.error(f"README file not found at {README_PATH}")
-        raise
+_dispatcher = None
 
-def extract_server_list(readme_content):
-    """Extract the server list from the README.md content"""
-    servers = []
-    
-    # First check how many servers are listed in the README
-    match = re.search(r'There are currently (\d+) MCP servers available:', readme_content)
-    expected_count = int(match.group(1)) if match else 0
+def check_servers(servers, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, bulk=False, previous_status=None,
+                  catalog_servers=None, registry_client=None, repositories=None):
+    """Check all servers concurrently and return the status keyed by server name, omitting failed re-checks"""
+    results = catalog.fetch_catalog(servers, DOCKER_HUB_API_URL, concurrency, rate, bulk, previous_status, catalog_servers,
+                                    registry=registry_client, repositories=repositories)
     
-    if expected_count > 0:
-        logging.info(f"README mentions {expected_count} MCP servers")
-    
-    # Find all table rows using regex pattern
-    matches = re.finditer(TABLE_PATTERN, readme_content)
-    
-    for match in matches:
-        index = match.group(1)
-        server_name = match.group(2).strip()
-        description = match.group(3).strip()
-        pull_count = match.group(4).strip()
-        link = match.group(5).strip()
-        
-        servers.append({
-            'index': index,
-            'server_name': server_name,
-            'description': description,
-            'pull_count': pull_count,
-            'link': link
-        })
-    
-    # Verify if we found all servers
-    found_count = len(servers)
-    logging.info(f"Found {found_count} servers in README.md table")
-    
-    if expected_count > 0 and found_count < expected_count:
-        logging.warning(f"Expected {expected_count} servers but only found {found_count}")
-        logging.warning("Some servers might be missing from the table or in a different format")
-    
-    return servers
+    # A failed check says nothing about the server, so keep its previous result rather than report a false outage
+    current_status = {}
+    kept = 0
+    for server_name, status in results.items():
+        if status['status'] == 'error' and server_name in (previous_status or {}):
+            kept += 1
+            continue
+        current_status[server_name] = status
+    if kept:
+        logging.warning(f"Kept the previous result of {kept} servers whose check failed")
+    return current_status
 
-def check_server(server_name):
-    """Check if a server is available on Docker Hub and get its details"""
-    server_name = server_name.strip()
-    result = {
-        'name': server_name,
-        'available': False,
-        'last_updated': None,
-        'status': 'unknown',
-        'version': None,
-        'pull_count': 0,
-        'timestamp': datetime.now().isoformat()
-    }
-    
+def make_registry_client(args):
+    """Return a registry client when digests are tracked or images analyzed, otherwise None"""
+    if not (args.digests or args.analyze_images):
+        return None
+    cache = image_analysis.BlobCache(args.manifest_cache) if args.analyze_images else None
+    return registry.RegistryClient(REGISTRY_URL, tags=args.track_tag or registry.DEFAULT_TAGS, cache=cache)
+
+def analyze_images(args, current_status, registry_client):
+    """Attach image sizes to the status and summarize layer sharing across the catalog"""
     try:
-        # Check if server exists on Docker Hub
-        url = f"{DOCKER_HUB_API_URL}{server_name}"
-        logging.info(f"Checking server {server_name} at {url}")
-        
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            result['available'] = True
-            result['last_updated'] = data.get('last_updated')
-            result['pull_count'] = data.get('pull_count', 0)
-            result['status'] = 'online'
-            
-            # Get latest tag/version info
-            tags_url = f"{DOCKER_HUB_API_URL}{server_name}/tags"
-            tags_response = requests.get(tags_url, timeout=10)
-            if tags_response.status_code == 200:
-                tags_data = tags_response.json()
-                if tags_data.get('results'):
-                    result['version'] = tags_data['results'][0].get('name')
-        else:
-            result['status'] = 'offline'
-            logging.warning(f"Server {server_name} returned status code {response.status_code}")
+        limiter = http_client.TokenBucket(args.rate)
+        images = image_analysis.analyze_catalog(registry_client, registry_client.cache, current_status, args.concurrency,
+                                                limiter)
+        return image_analysis.record_images(current_status, images), image_analysis.summarize(images)
     except Exception as e:
-        result['status'] = 'error'
-        logging.error(f"Error checking server {server_name}: {e}")
-    
-    return result
+        logging.error(f"Error analyzing images: {e}")
+        return current_status, None
 
-def load_previous_status():
-    """Load the previous server status from file"""
+def probe_servers(args, checked_status, previous_status):
+    """Attach an MCP handshake probe to every freshly checked online server"""
+    names = [name for name, data in checked_status.items() if data['status'] == 'online']
+    probes = mcp_probe.probe_servers(names, args.probe_command, args.probe_timeout, args.probe_workers,
+                                     args.probe_pull_command, args.probe_cleanup_command)
+    for name, probe in probes.items():
+        earlier = (previous_status.get(name) or {}).get('probe')
+        checked_status[name]['probe'] = mcp_probe.update_baseline(probe, earlier)
+    return checked_status
+
+def load_previous_status(names=None):
+    """Load the previous server status from file, only for the servers in `names` when given"""
     try:
+        status_store.migrate_legacy(LEGACY_STATUS_FILE, SERVER_STATUS_FILE)
         if os.path.exists(SERVER_STATUS_FILE):
-            with open(SERVER_STATUS_FILE, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return status_store.load_status(SERVER_STATUS_FILE, names)
         return {}
     except Exception as e:
         logging.error(f"Error loading previous status: {e}")
@@ -150,28 +141,49 @@ def load_previous_status():
 def save_status(status_data):
     """Save the current server status to file"""
     try:
-        with open(SERVER_STATUS_FILE, 'w', encoding='utf-8') as file:
-            json.dump(status_data, file, indent=2)
+        status_store.write_status(status_data.items(), SERVER_STATUS_FILE)
         logging.info(f"Server status saved to {SERVER_STATUS_FILE}")
     except Exception as e:
         logging.error(f"Error saving status: {e}")
 
-def detect_changes(previous_status, current_status):
-    """Detect changes in server status"""
+def record_history(path, results):
+    """Append check results to the time-series history store"""
+    try:
+        db = history_store.connect(path)
+        try:
+            history_store.record_results(db, results)
+        finally:
+            db.close()
+    except Exception as e:
+        logging.error(f"Error recording history: {e}")
+
+def update_readme(current_status, repositories=None):
+    """Write the pull counts of this run's result set, refreshed from the namespace listing if any, to the README table"""
+    try:
+        readme_content = catalog.read_readme(README_PATH)
+        servers = catalog.extract_server_list(readme_content)
+        
+        # The listing has fresh pull counts for every server, including those not due for a check
+        if repositories:
+            current_status = catalog.apply_listing(current_status, repositories)
+        catalog.apply_pull_counts(servers, current_status)
+        updated_content = catalog.update_readme_with_pull_counts(readme_content, servers)
+        catalog.write_readme(updated_content, readme_content, README_PATH)
+    except Exception as e:
+        logging.error(f"Error updating pull counts in {README_PATH}: {e}")
+
+def detect_changes(previous_status, current_status, statistics=None):
+    """Detect changes in server status, judged against rolling history statistics when available"""
     changes = []
+    statistics = statistics or {}
     
     for server_name, current in current_status.items():
         if server_name in previous_status:
             prev = previous_status[server_name]
+            stats = statistics.get(server_name)
             
-            # Check for status changes
-            if current['status'] != prev['status']:
-                changes.append({
-                    'server': server_name,
-                    'type': 'status',
-                    'previous': prev['status'],
-                    'current': current['status']
-                })
+            # Check for status changes, collapsing oscillation into a single flapping event
+            changes.extend(anomaly.status_changes(server_name, prev, current, stats))
             
             # Check for version changes
             if current['version'] != prev['version'] and current['version'] is not None:
@@ -181,9 +193,23 @@ def detect_changes(previous_status, current_status):
                     'previous': prev['version'],
                     'current': current['version']
                 })
-                
-            # Check for significant pull count changes (>10%)
-            if prev['pull_count'] > 0 and current['pull_count'] > 0:
+            
+            # Check for images rebuilt under the same tag
+            changes.extend(registry.digest_changes(server_name, prev.get('digests'), current.get('digests')))
+            
+            # Check for images that grew noticeably
+            changes.extend(image_analysis.size_changes(server_name, prev, current))
+            
+            # Check for servers that stopped answering MCP or start much slower than usual
+            changes.extend(mcp_probe.probe_changes(server_name, prev, current))
+            
+            # Check for pull count anomalies against the server's history
+            anomalies = anomaly.pull_count_changes(server_name, prev, current, stats)
+            if anomalies is not None:
+                changes.extend(anomalies)
+            
+            # Fall back to significant pull count changes (>10%) while the history is too short
+            elif prev['pull_count'] > 0 and current['pull_count'] > 0:
                 percentage_change = (current['pull_count'] - prev['pull_count']) / prev['pull_count'] * 100
                 if abs(percentage_change) >= 10:
                     changes.append({
@@ -213,230 +239,358 @@ def detect_changes(previous_status, current_status):
 
 def format_output(servers_status, changes, output_format='markdown'):
     """Format the output based on the specified format"""
-    if output_format == 'json':
-        return json.dumps({
-            'status': servers_status,
-            'changes': changes,
-            'timestamp': datetime.now().isoformat()
-        }, indent=2)
+    return report_renderer.render_string(servers_status, changes, output_format)
+
+def write_report(servers_status, changes, args, emit=True, notification_body=None, image_summary=None):
+    """Render the report once, streaming it to stdout, report files and the notification body"""
+    with contextlib.ExitStack() as stack:
+        sinks = []
+        if emit:
+            sinks.append(report_renderer.make_sink(args.output, sys.stdout))
+        for output_format, path in args.report or []:
+            stream = stack.enter_context(open(path, 'w', encoding='utf-8', newline=''))
+            sinks.append(report_renderer.make_sink(output_format, stream))
+        if notification_body is not None:
+            sinks.append(report_renderer.make_sink(args.output, notification_body))
+        if sinks:
+            report_renderer.render(servers_status, changes, sinks, image_summary=image_summary)
+
+def send_notification(changes, servers_status, output_format='markdown', digest_window=notifier.DEFAULT_DIGEST_WINDOW,
+                      body=None):
+    """Queue changes for the background notification dispatcher"""
+    global _dispatcher
+    if not changes:
+        logging.info("No changes detected, skipping notification")
+        return
     
-    elif output_format == 'text':
-        text_output = []
-        text_output.append(f"SERVER CHECK REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        text_output.append("\nSERVER STATUS:")
-        
-        headers = ["Name", "Status", "Version", "Last Updated", "Pull Count"]
-        rows = []
+    if _dispatcher is None:
+        _dispatcher = notifier.NotificationDispatcher(
+            format_output, output_format, NOTIFICATION_EMAIL, SLACK_WEBHOOK, digest_window
+        )
+    _dispatcher.submit(changes, servers_status, body)
+
+def flush_notifications(timeout=None):
+    """Wait for queued notifications to be delivered"""
+    global _dispatcher
+    if _dispatcher is not None:
+        with metrics.phase('notify'):
+            _dispatcher.close(timeout)
+        _dispatcher = None
+
+def load_servers(args):
+    """Read README.md and extract the server list"""
+    with metrics.phase('readme'):
+        # Read the README.md content
+        readme_content = catalog.read_readme(README_PATH)
         
-        for name, data in servers_status.items():
-            rows.append([
-                name,
-                data['status'],
-                data['version'] or 'N/A',
-                data['last_updated'] or 'N/A',
-                f"{data['pull_count']:,}" if data['pull_count'] else 'N/A'
-            ])
+        # Extract server list
+        if args.full_scan:
+            servers = catalog.find_all_mcp_servers(readme_content)
+        else:
+            servers = catalog.extract_server_list(readme_content)
+    
+    logging.info(f"Found {len(servers)} servers in README.md")
+    return servers
+
+def select_servers(args, servers, previous_status):
+    """Return the servers to check this run, the loaded schedule and whether it is a full sweep"""
+    if not args.incremental:
+        return servers, None, True
+    
+    # In incremental mode only check the servers whose next-check time has passed
+    with metrics.phase('schedule'):
+        schedule = scheduler.load_schedule()
+        due_servers, full_sweep = scheduler.select_due(servers, previous_status, schedule, args.full_sweep_hours)
+    return due_servers, schedule, full_sweep
+
+def run_check(args, servers, previous_status, emit=True, checked_status=None, full_sweep=True):
+    """Run one check cycle: check, detect changes, report, persist and notify"""
+    registry_client = make_registry_client(args)
+    
+    # Merged shard results arrive already checked; otherwise check the due servers now
+    repositories = None
+    if checked_status is None:
+        due_servers, schedule, full_sweep = select_servers(args, servers, previous_status)
         
-        text_output.append(tabulate(rows, headers=headers))
+        # In bulk mode list the namespace once, for the checks and for the pull counts of servers that are not due
+        if args.bulk and (due_servers or args.update_readme):
+            repositories = catalog.list_repositories(DOCKER_HUB_API_URL, args.rate)
         
-        if changes:
-            text_output.append("\nCHANGES DETECTED:")
-            for change in changes:
-                if change['type'] == 'status':
-                    text_output.append(f"- {change['server']}: Status changed from {change['previous']} to {change['current']}")
-                elif change['type'] == 'version':
-                    text_output.append(f"- {change['server']}: Version updated from {change['previous']} to {change['current']}")
-                elif change['type'] == 'pull_count':
-                    text_output.append(f"- {change['server']}: Pull count changed by {change['percentage']}% ({change['previous']:,} ? {change['current']:,})")
-                elif change['type'] == 'new':
-                    text_output.append(f"- {change['server']}: New server detected (Status: {change['status']})")
-                elif change['type'] == 'removed':
-                    text_output.append(f"- {change['server']}: Server removed")
+        # Check servers concurrently
+        with metrics.phase('check'):
+            checked_status = check_servers(due_servers, args.concurrency, args.rate, args.bulk, previous_status, servers,
+                                           registry_client if args.digests else None, repositories)
         
-        return "\n".join(text_output)
+        # Launch the servers that are up and time their MCP handshake
+        if args.probe:
+            with metrics.phase('probe'):
+                probe_servers(args, checked_status, previous_status)
+    else:
+        schedule = scheduler.load_schedule() if args.incremental else None
     
-    else:  # markdown
-        md_output = []
-        md_output.append(f"# MCP Server Check Report\n")
-        md_output.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        
-        md_output.append("## Server Status\n")
-        md_output.append("| Server | Status | Version | Last Updated | Pull Count |")
-        md_output.append("|--------|--------|---------|--------------|------------|")
-        
-        for name, data in servers_status.items():
-            status_emoji = "?" if data['status'] == 'online' else "?" if data['status'] == 'offline' else "??"
-            md_output.append(f"| {name} | {status_emoji} {data['status']} | {data['version'] or 'N/A'} | {data['last_updated'] or 'N/A'} | {data['pull_count']:,} |")
+    current_status = scheduler.merge_status(servers, checked_status, previous_status)
+    
+    # Analyze image sizes and shared layers from the content-addressed manifest cache
+    image_summary = None
+    if args.analyze_images:
+        with metrics.phase('image_analysis'):
+            current_status, image_summary = analyze_images(args, current_status, registry_client)
+    
+    # Detect changes against the rolling statistics of the history window
+    with metrics.phase('detect_changes'):
+        statistics = None
+        if not args.no_history:
+            statistics = anomaly.load_statistics(args.history_db, args.anomaly_window_days)
+        changes = detect_changes(previous_status, current_status, statistics)
+    
+    # Render the report once for stdout, report files and the notification body
+    notification_body = io.StringIO() if args.notify and changes else None
+    with metrics.phase('render'):
+        write_report(current_status, changes, args, emit, notification_body, image_summary)
+    
+    with metrics.phase('save_status'):
+        # Save current status for future comparison
+        save_status(current_status)
         
-        if changes:
-            md_output.append("\n## Changes Detected\n")
-            for change in changes:
-                if change['type'] == 'status':
-                    md_output.append(f"- **{change['server']}**: Status changed from `{change['previous']}` to `{change['current']}`")
-                elif change['type'] == 'version':
-                    md_output.append(f"- **{change['server']}**: Version updated from `{change['previous']}` to `{change['current']}`")
-                elif change['type'] == 'pull_count':
-                    direction = "?" if change['percentage'] > 0 else "?"
-                    md_output.append(f"- **{change['server']}**: Pull count changed by {direction} {abs(change['percentage'])}% ({change['previous']:,} ? {change['current']:,})")
-                elif change['type'] == 'new':
-                    md_output.append(f"- **{change['server']}**: New server detected (Status: `{change['status']}`)")
-                elif change['type'] == 'removed':
-                    md_output.append(f"- **{change['server']}**: Server removed")
+        # Append the freshly checked results to the history store
+        if not args.no_history:
+            record_history(args.history_db, checked_status.values())
         
-        return "\n".join(md_output)
+        # Reschedule the servers that were just checked
+        if schedule is not None:
+            scheduler.update_schedule(schedule, checked_status, changes, current_status, full_sweep)
+            scheduler.save_schedule(schedule)
+    
+    # Derive the README pull counts from the same result set instead of fetching them again
+    if args.update_readme:
+        with metrics.phase('update_readme'):
+            update_readme(current_status, repositories)
+    
+    # Send notification if needed and requested
+    if args.notify and changes:
+        with metrics.phase('notify'):
+            send_notification(changes, current_status, args.output, args.notify_digest,
+                              notification_body.getvalue())
+    
+    return current_status, changes
 
-def send_notification(changes, servers_status, output_format='markdown'):
-    """Send notification if there are changes"""
-    if not changes:
-        logging.info("No changes detected, skipping notification")
-        return
+def run_shard(args, servers, previous_status):
+    """Check this shard's part of the server list and write its partial results"""
+    shard_servers = sharding.select_shard(servers, args.shard)
+    due_servers, _, full_sweep = select_servers(args, shard_servers, previous_status)
+    logging.info(f"Shard {args.shard[0]}/{args.shard[1]}: checking {len(due_servers)} of {len(shard_servers)} servers")
     
-    formatted_output = format_output(servers_status, changes, output_format)
+    with metrics.phase('check'):
+        checked_status = check_servers(due_servers, args.concurrency, args.rate, args.bulk, previous_status, servers,
+                                       make_registry_client(args) if args.digests else None)
     
-    # Email notification
-    if NOTIFICATION_EMAIL:
-        try:
-            import smtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            # Setup email parameters
-            smtp_server = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
-            smtp_port = int(os.environ.get('SMTP_PORT', 587))
-            smtp_username = os.environ.get('SMTP_USERNAME')
-            smtp_password = os.environ.get('SMTP_PASSWORD')
-            
-            if smtp_username and smtp_password:
-                msg = MIMEMultipart()
-                msg['Subject'] = f"MCP Server Status Changes - {datetime.now().strftime('%Y-%m-%d')}"
-                msg['From'] = smtp_username
-                msg['To'] = NOTIFICATION_EMAIL
-                
-                if output_format == 'markdown':
-                    # Convert markdown to HTML
-                    import markdown
-                    html_content = markdown.markdown(formatted_output)
-                    msg.attach(MIMEText(html_content, 'html'))
-                    msg.attach(MIMEText(formatted_output, 'plain'))
-                else:
-                    msg.attach(MIMEText(formatted_output, 'plain'))
-                
-                server = smtplib.SMTP(smtp_server, smtp_port)
-                server.starttls()
-                server.login(smtp_username, smtp_password)
-                server.send_message(msg)
-                server.quit()
-                
-                logging.info(f"Email notification sent to {NOTIFICATION_EMAIL}")
-            else:
-                logging.warning("Email notification enabled but SMTP credentials not provided")
-        except Exception as e:
-            logging.error(f"Failed to send email notification: {e}")
+    if args.probe:
+        with metrics.phase('probe'):
+            probe_servers(args, checked_status, previous_status)
     
-    # Slack notification
-    if SLACK_WEBHOOK:
-        try:
-            slack_data = {
-                "text": "MCP Server Status Update",
-                "blocks": [
-                    {
-                        "type": "header",
-                        "text": {
-                            "type": "plain_text",
-                            "text": f"MCP Server Status Changes - {datetime.now().strftime('%Y-%m-%d')}"
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": formatted_output if output_format == 'markdown' else f"```\n{formatted_output}\n```"
-                        }
-                    }
-                ]
-            }
-            
-            response = requests.post(
-                SLACK_WEBHOOK,
-                data=json.dumps(slack_data),
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code != 200:
-                logging.error(f"Failed to send Slack notification: {response.status_code} - {response.text}")
-            else:
-                logging.info("Slack notification sent successfully")
-                
-        except Exception as e:
-            logging.error(f"Failed to send Slack notification: {e}")
+    # Fingerprint the inputs so the merge can tell whether every shard saw the same catalog and status
+    path = args.partial or sharding.partial_path(SHARD_PREFIX, args.shard)
+    sharding.write_partial(path, args.shard, {
+        'full_sweep': full_sweep,
+        'readme_sha256': sharding.file_sha256(README_PATH),
+        'status_sha256': sharding.file_sha256(SERVER_STATUS_FILE),
+        'status': checked_status
+    })
+    logging.info(f"Shard results written to {path}")
 
-def find_all_mcp_servers(readme_content):
-    """Find all MCP servers mentioned in the README, even those not in the main table"""
-    # First, get the servers from the main table using standard parsing
-    table_servers = extract_server_list(readme_content)
+def run_merge(args, servers, previous_status):
+    """Combine every shard's partial results and finish the run as a single check"""
+    partials = sharding.load_partials(args.merge)
+    readme_hash = sharding.file_sha256(README_PATH)
+    status_hash = sharding.file_sha256(SERVER_STATUS_FILE)
+    if any(partial.get('readme_sha256') != readme_hash for partial in partials):
+        raise ValueError("README.md changed since the shards ran; re-run the shards before merging")
+    if any(partial.get('status_sha256') != status_hash for partial in partials):
+        raise ValueError(f"{SERVER_STATUS_FILE} changed since the shards ran; re-run the shards before merging")
     
-    # Look for supplementary server information if needed
-    # This would need to be customized based on how the other servers are listed
+    checked_status = {}
+    for partial in partials:
+        checked_status.update(partial['status'])
+    full_sweep = all(partial['full_sweep'] for partial in partials)
+    logging.info(f"Merged {len(checked_status)} results from {len(partials)} shards")
+    
+    return run_check(args, servers, previous_status, checked_status=checked_status, full_sweep=full_sweep)
+
+def publish_outputs(args):
+    """Commit the status, schedule, report and README files to GitHub as a single commit"""
+    if not GITHUB_TOKEN:
+        logging.error("GITHUB_TOKEN environment variable not set. Cannot commit changes.")
+        return False
     
-    return table_servers
+    paths = [SERVER_STATUS_FILE]
+    if args.update_readme:
+        paths.append(README_PATH)
+    if os.path.exists(scheduler.SCHEDULE_FILE):
+        paths.append(scheduler.SCHEDULE_FILE)
+    paths.extend(path for _, path in args.report or [])
+    
+    try:
+        files = {}
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as file:
+                files[path] = file.read()
+        # The status file replaced the legacy JSON document; remove it from the branch too
+        files[LEGACY_STATUS_FILE] = None
+        commit_message = f"Update server status - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        with metrics.phase('github_push'):
+            github_publisher.publish(GITHUB_REPO_URL, GITHUB_TOKEN, files, commit_message, GITHUB_BRANCH)
+        return True
+    except Exception as e:
+        logging.error(f"Error committing changes: {e}")
+        return False
+
+def run_daemon(args):
+    """Re-check on an interval with warm state, serving results over a local HTTP port"""
+    server = status_server.start(args.host, args.port)
+    previous_status = load_previous_status()
+    servers = None
+    readme_mtime = None
+    
+    try:
+        while True:
+            try:
+                # Only re-parse the README when it has changed on disk
+                mtime = os.path.getmtime(README_PATH)
+                if mtime != readme_mtime:
+                    servers = load_servers(args)
+                    readme_mtime = mtime
+                
+                previous_status, changes = run_check(args, servers, previous_status, emit=False)
+                status_server.publish(previous_status, changes)
+                logging.info(f"Check cycle completed with {len(changes)} changes")
+            except Exception as e:
+                logging.error(f"Error in check cycle: {e}")
+            
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        logging.info("Daemon stopped")
+    finally:
+        server.shutdown()
 
 def main():
     """Main function to check server status"""
     parser = argparse.ArgumentParser(description='Check Docker MCP servers status')
-    parser.add_argument('--output', choices=['text', 'json', 'markdown'], default='markdown',
+    parser.add_argument('--output', choices=report_renderer.FORMATS, default='markdown',
                         help='Output format (default: markdown)')
+    parser.add_argument('--report', action='append', type=report_renderer.parse_report_target, metavar='FORMAT:PATH',
+                        help='Also write the report to PATH in FORMAT; may be repeated')
     parser.add_argument('--notify', action='store_true', help='Send notification on status changes')
+    parser.add_argument('--update-readme', action='store_true',
+                        help='Also update the README pull counts from this run\'s results, without extra requests')
+    parser.add_argument('--commit', action='store_true',
+                        help='Commit the status, schedule, report and README files to GitHub as one commit')
+    parser.add_argument('--notify-digest', type=float, default=notifier.DEFAULT_DIGEST_WINDOW,
+                        help=f'Merge changes arriving within this many seconds into one notification (default: {notifier.DEFAULT_DIGEST_WINDOW:g})')
+    parser.add_argument('--notify-timeout', type=float, default=DEFAULT_NOTIFY_TIMEOUT,
+                        help=f'Seconds to wait for pending notifications before exiting (default: {DEFAULT_NOTIFY_TIMEOUT})')
     parser.add_argument('--full-scan', action='store_true', 
                         help='Scan the entire README for servers, not just the visible table')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Number of servers checked in parallel (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=http_client.parse_rate, default=DEFAULT_RATE,
+                        help=f'Maximum Docker Hub requests per second (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Fetch repository data from one paginated namespace listing instead of per server')
+    parser.add_argument('--digests', action='store_true',
+                        help='Detect image updates from registry manifest digests (HEAD requests) instead of the tag listing')
+    parser.add_argument('--track-tag', action='append', metavar='TAG',
+                        help=f'Tag whose manifest digest is tracked with --digests; repeatable (default: {", ".join(registry.DEFAULT_TAGS)})')
+    parser.add_argument('--analyze-images', action='store_true',
+                        help='Report image sizes, layers shared across images and size regressions')
+    parser.add_argument('--manifest-cache', default=image_analysis.CACHE_DIR,
+                        help=f'Content-addressed manifest and blob cache directory (default: {image_analysis.CACHE_DIR})')
+    parser.add_argument('--probe', action='store_true',
+                        help='Probe each online server with the MCP initialize + tools/list handshake')
+    parser.add_argument('--probe-command', default=mcp_probe.DEFAULT_COMMAND, metavar='TEMPLATE',
+                        help=f'Command launching a server over stdio, with {{name}}, {{image}} and {{container}} placeholders (default: {mcp_probe.DEFAULT_COMMAND})')
+    parser.add_argument('--probe-pull-command', default=mcp_probe.DEFAULT_PULL_COMMAND, metavar='TEMPLATE',
+                        help=f'Command run before the probe timer starts; empty to skip (default: {mcp_probe.DEFAULT_PULL_COMMAND})')
+    parser.add_argument('--probe-cleanup-command', default=mcp_probe.DEFAULT_CLEANUP_COMMAND, metavar='TEMPLATE',
+                        help=f'Command run after every probe; empty to skip (default: {mcp_probe.DEFAULT_CLEANUP_COMMAND})')
+    parser.add_argument('--probe-timeout', type=float, default=mcp_probe.DEFAULT_TIMEOUT,
+                        help=f'Seconds allowed for one server to complete the handshake (default: {mcp_probe.DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--probe-workers', type=int, default=mcp_probe.DEFAULT_WORKERS,
+                        help=f'Number of servers probed at the same time (default: {mcp_probe.DEFAULT_WORKERS})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only check servers whose adaptive next-check time has passed')
+    parser.add_argument('--full-sweep-hours', type=float, default=scheduler.DEFAULT_FULL_SWEEP_HOURS,
+                        help=f'Force a full sweep in incremental mode after this many hours (default: {scheduler.DEFAULT_FULL_SWEEP_HOURS})')
+    parser.add_argument('--history-db', default=history_store.HISTORY_DB,
+                        help=f'Time-series history database (default: {history_store.HISTORY_DB})')
+    parser.add_argument('--no-history', action='store_true', help='Do not record check results in the history database')
+    parser.add_argument('--anomaly-window-days', type=float, default=anomaly.DEFAULT_WINDOW_DAYS,
+                        help=f'History window for z-scores and moving averages (default: {anomaly.DEFAULT_WINDOW_DAYS})')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running, re-checking on an interval and serving /status, /changes and /metrics')
+    parser.add_argument('--interval', type=float, default=DEFAULT_DAEMON_INTERVAL,
+                        help=f'Seconds between check cycles in daemon mode (default: {DEFAULT_DAEMON_INTERVAL})')
+    parser.add_argument('--host', default=status_server.DEFAULT_HOST,
+                        help=f'Status endpoint address in daemon mode (default: {status_server.DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=status_server.DEFAULT_PORT,
+                        help=f'Status endpoint port in daemon mode (default: {status_server.DEFAULT_PORT})')
+    parser.add_argument('--shard', type=sharding.parse_shard, metavar='I/N',
+                        help='Only check shard I of N and write its partial results for a later --merge')
+    parser.add_argument('--partial', metavar='FILE',
+                        help=f'Partial results file written by --shard (default: {SHARD_PREFIX}.shard-I-of-N.json)')
+    parser.add_argument('--merge', nargs='+', metavar='FILE',
+                        help='Combine the partial results of every shard and report them as a single run')
+    http_client.add_cache_arguments(parser)
+    http_client.add_cassette_arguments(parser)
+    metrics.add_arguments(parser, 'server_check')
+    log_setup.add_arguments(parser, LOG_FILE)
     
     args = parser.parse_args()
+    if sum(map(bool, (args.shard, args.merge, args.daemon))) > 1:
+        parser.error('--shard, --merge and --daemon are mutually exclusive')
     
+    log_setup.configure_from_args(args)
     logging.info("Starting MCP server check process")
+    metrics.start(args, 'check_mcp_servers')
+    http_client.enable_cache_from_args(args)
+    http_client.enable_cassette_from_args(args)
+    http_client.configure(pool_maxsize=max(args.concurrency, http_client.POOL_MAXSIZE))
     
     try:
-        # Read the README.md content
-        readme_content = read_readme()
+        if args.daemon:
+            run_daemon(args)
+            return
         
-        # Extract server list
-        if args.full_scan:
-            servers = find_all_mcp_servers(readme_content)
-        else:
-            servers = extract_server_list(readme_content)
-            
-        logging.info(f"Found {len(servers)} servers in README.md")
-        
-        # Load previous status
-        previous_status = load_previous_status()
-        
-        # Check each server and build current status
-        current_status = {}
-        for server in servers:
-            server_name = server['server_name']
-            status = check_server(server_name)
-            current_status[server_name] = status
-            
-            # Add a small delay to avoid rate limiting
-            time.sleep(1)
-        
-        # Detect changes
-        changes = detect_changes(previous_status, current_status)
+        servers = load_servers(args)
         
-        # Format and display output
-        output = format_output(current_status, changes, args.output)
-        print(output)
+        # Load previous status; a shard streams the file and keeps only its own servers' records
+        with metrics.phase('load_status'):
+            if args.shard:
+                shard_servers = sharding.select_shard(servers, args.shard)
+                previous_status = load_previous_status({server['server_name'] for server in shard_servers})
+            else:
+                previous_status = load_previous_status()
         
-        # Save current status for future comparison
-        save_status(current_status)
+        if args.shard:
+            run_shard(args, servers, previous_status)
+        elif args.merge:
+            run_merge(args, servers, previous_status)
+        else:
+            run_check(args, servers, previous_status)
         
-        # Send notification if needed and requested
-        if args.notify and changes:
-            send_notification(changes, current_status, args.output)
+        # Shards leave publishing to the merge step
+        if args.commit and not args.shard and not publish_outputs(args):
+            logging.warning("Failed to commit changes to GitHub")
             
         logging.info("MCP server check completed")
         
     except Exception as e:
         logging.error(f"Error checking MCP servers: {e}")
         raise
+    finally:
+        flush_notifications(args.notify_timeout)
+        metrics.finish(args)
+        http_client.close_cassette()
+        http_client.disable_cache()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Docker Hub helpers shared by the MCP server scripts.
+This module:
+1. Paginates the `mcp` namespace listing, which returns pull counts and
+   last-updated times for up to 100 repositories per request
+2. Joins the listing to the servers parsed from README.md
+"""
+
+import logging
+import http_client
+
+# Constants
+NAMESPACE_PAGE_SIZE = 100
+UNLISTED_LOG_LIMIT = 20
+
+def list_namespace_repositories(api_url, limiter=None, page_size=NAMESPACE_PAGE_SIZE):
+    """Return every repository in the namespace keyed by name, or None if the listing fails"""
+    repositories = {}
+    url = f"{api_url}?page_size={page_size}"
+
+    try:
+        while url:
+            response = http_client.get(url, limiter=limiter)
+            if response.status_code != 200:
+                logging.warning(f"Namespace listing returned status code {response.status_code}")
+                return None
+            data = response.json()
+            for repository in data.get('results', []):
+                repositories[repository['name']] = repository
+            url = data.get('next')
+    except Exception as e:
+        logging.warning(f"Error listing Docker Hub namespace: {e}")
+        return None
+
+    logging.info(f"Docker Hub namespace listing returned {len(repositories)} repositories")
+    return repositories
+
+def join_servers(servers, repositories, catalog=None):
+    """Split servers into listed and missing ones, plus namespace repos absent from the README catalog"""
+    listed = []
+    missing = []
+    for server in servers:
+        if server['server_name'] in repositories:
+            listed.append(server)
+        else:
+            missing.append(server)
+
+    readme_names = {server['server_name'] for server in (servers if catalog is None else catalog)}
+    unlisted = sorted(name for name in repositories if name not in readme_names)
+    if unlisted:
+        shown = ', '.join(unlisted[:UNLISTED_LOG_LIMIT])
+        more = f" and {len(unlisted) - UNLISTED_LOG_LIMIT} more" if len(unlisted) > UNLISTED_LOG_LIMIT else ""
+        logging.warning(f"{len(unlisted)} Docker Hub repositories are not in README.md: {shown}{more}")
+
+    return listed, missing, unlisted
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Content-addressed publishing of generated files to GitHub.
+This module:
+1. Hashes each output exactly as git hashes a blob
+2. Compares the hashes with the files in the branch's current tree and
+   skips publishing when nothing changed
+3. Pushes all changed and deleted files together as one commit through the
+   git trees API (tree, commit, then a fast-forward ref update)
+4. Starts over from the new branch head when the ref update conflicts with
+   a concurrent push
+"""
+
+import os
+import hashlib
+import logging
+import http_client
+
+# Constants
+DEFAULT_BRANCH = 'main'
+MAX_ATTEMPTS = 3
+FILE_MODE = '100644'
+
+class PublishError(Exception):
+    """Raised when the GitHub API rejects a publishing step"""
+
+def blob_sha(content):
+    """Return the git blob SHA-1 of `content`"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def _check(response, step, expected=(200, 201)):
+    if response.status_code not in expected:
+        raise PublishError(f"{step} failed: {response.status_code} - {response.text}")
+    return response.json()
+
+def tree_path(path, root='.'):
+    """Return `path` relative to the repository root as a git tree path; raise PublishError if it lies outside"""
+    root = os.path.abspath(root)
+    relative = os.path.relpath(os.path.abspath(os.path.join(root, path)), root)
+    if relative == os.curdir or relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        raise PublishError(f"Cannot publish {path}: not a file inside the repository root {root}")
+    return relative.replace(os.sep, '/')
+
+def publish(repo_url, token, files, message, branch=DEFAULT_BRANCH, root='.'):
+    """Push `files` ({path: content, or None to delete}) as one commit to `branch`; return its SHA, or None if unchanged"""
+    headers = {
+        'Authorization': f'token {token}',
+        'Accept': 'application/vnd.github.v3+json'
+    }
+    files = {tree_path(path, root): content for path, content in files.items()}
+    hashes = {path: None if content is None else blob_sha(content) for path, content in files.items()}
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        # Resolve the branch head and the blob SHAs of its tree
+        ref = _check(http_client.get(f"{repo_url}/git/ref/heads/{branch}", headers=headers, use_cache=False), 'Reading ref')
+        head = ref['object']['sha']
+        commit = _check(http_client.get(f"{repo_url}/git/commits/{head}", headers=headers, use_cache=False), 'Reading commit')
+        tree = _check(http_client.get(f"{repo_url}/git/trees/{commit['tree']['sha']}?recursive=1",
+                                      headers=headers, use_cache=False), 'Reading tree')
+        remote = {entry['path']: entry['sha'] for entry in tree['tree'] if entry['type'] == 'blob'}
+
+        changed = sorted(path for path, sha in hashes.items() if remote.get(path) != sha)
+        if not changed:
+            logging.info(f"All {len(files)} published files are unchanged on GitHub, nothing to commit")
+            return None
+
+        # Create one tree with every changed file on top of the head's tree, then one commit;
+        # a null SHA removes a file from the tree
+        entries = [
+            {'path': path, 'mode': FILE_MODE, 'type': 'blob', 'sha': None} if files[path] is None else
+            {'path': path, 'mode': FILE_MODE, 'type': 'blob', 'content': files[path]}
+            for path in changed
+        ]
+        new_tree = _check(http_client.post(f"{repo_url}/git/trees", json={'base_tree': commit['tree']['sha'], 'tree': entries},
+                                           headers=headers), 'Creating tree')
+        new_commit = _check(http_client.post(f"{repo_url}/git/commits",
+                                             json={'message': message, 'tree': new_tree['sha'], 'parents': [head]},
+                                             headers=headers), 'Creating commit')
+
+        # Fast-forward the branch; a conflict means someone pushed in between
+        response = http_client.patch(f"{repo_url}/git/refs/heads/{branch}", json={'sha': new_commit['sha'], 'force': False},
+                                     headers=headers)
+        if response.status_code in (409, 422):
+            logging.warning(f"Branch {branch} moved during publishing (attempt {attempt}): {response.text}")
+            continue
+        _check(response, 'Updating ref')
+        logging.info(f"Published {', '.join(changed)} to {branch} as {new_commit['sha'][:12]}")
+        return new_commit['sha']
+
+    raise PublishError(f"Branch {branch} kept moving after {MAX_ATTEMPTS} attempts")
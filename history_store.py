@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Append-only time-series history of MCP server check results.
+This module:
+1. Appends every check result with its timestamp to a SQLite database
+2. Answers indexed range queries per server and time window
+3. Downsamples old data to one row per server and hour/day/week, then compacts the file
+4. Keeps per-server daily aggregates of pull rates and status transitions,
+   updated as results are appended, so window statistics stay cheap
+
+Usage:
+  python history_store.py query SERVER [--since ISO] [--until ISO]
+  python history_store.py compact [--older-than-days N] [--bucket day]
+"""
+
+import json
+import sqlite3
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+# Constants
+HISTORY_DB = 'server_history.db'
+BUCKETS = {
+    'hour': "substr(timestamp, 1, 13)",
+    'day': "substr(timestamp, 1, 10)",
+    'week': "strftime('%Y-%W', timestamp)"
+}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS checks (
+    server TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    status TEXT,
+    available INTEGER,
+    version TEXT,
+    pull_count INTEGER,
+    last_updated TEXT
+);
+CREATE INDEX IF NOT EXISTS checks_server_time ON checks (server, timestamp);
+CREATE INDEX IF NOT EXISTS checks_time ON checks (timestamp);
+CREATE TABLE IF NOT EXISTS latest (
+    server TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    status TEXT,
+    pull_count INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_rates (
+    server TEXT NOT NULL,
+    day TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    rate_sum REAL NOT NULL,
+    rate_square_sum REAL NOT NULL,
+    transitions INTEGER NOT NULL,
+    PRIMARY KEY (server, day)
+) WITHOUT ROWID;
+'''
+COLUMNS = ('server', 'timestamp', 'status', 'available', 'version', 'pull_count', 'last_updated')
+
+def connect(path=HISTORY_DB):
+    """Open the history database, creating its schema if needed"""
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    
+    # Databases written before the daily aggregates existed get them built once from the raw rows
+    if db.execute("SELECT 1 FROM latest LIMIT 1").fetchone() is None:
+        rows = db.execute(f"SELECT {', '.join(COLUMNS)} FROM checks ORDER BY server, timestamp").fetchall()
+        if rows:
+            with db:
+                update_rates(db, rows)
+            logging.info(f"Built daily rate aggregates from {len(rows)} history rows")
+    return db
+
+def update_rates(db, rows):
+    """Fold new check rows into the latest-result table and the per-server daily aggregates"""
+    names = list({row[0] for row in rows})
+    latest = {}
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        sql = f"SELECT server, timestamp, status, pull_count FROM latest WHERE server IN ({', '.join('?' * len(chunk))})"
+        for server, timestamp, status, pull_count in db.execute(sql, chunk):
+            latest[server] = (timestamp, status, pull_count)
+
+    rates = []
+    for server, timestamp, status, _, _, pull_count, _ in sorted(rows, key=lambda row: (row[0], row[1])):
+        previous = latest.get(server)
+        if previous is not None and timestamp <= previous[0]:
+            continue
+        latest[server] = (timestamp, status, pull_count)
+        if previous is None:
+            continue
+
+        # Pulls per day since the server's previous check, when both checks saw a pull count
+        rate = None
+        days = (datetime.fromisoformat(timestamp) - datetime.fromisoformat(previous[0])).total_seconds() / 86400
+        if days > 0 and (pull_count or 0) > 0 and (previous[2] or 0) > 0:
+            rate = (pull_count - previous[2]) / days
+        rates.append((
+            server, timestamp[:10], int(rate is not None), rate or 0.0, (rate or 0.0) ** 2, int(status != previous[1])
+        ))
+
+    db.executemany('''
+        INSERT INTO daily_rates VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (server, day) DO UPDATE SET
+            samples = samples + excluded.samples,
+            rate_sum = rate_sum + excluded.rate_sum,
+            rate_square_sum = rate_square_sum + excluded.rate_square_sum,
+            transitions = transitions + excluded.transitions
+    ''', rates)
+    db.executemany(
+        "INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?)",
+        [(server, *latest[server]) for server in names]
+    )
+
+def rate_statistics(db, since, recent):
+    """Sum the daily aggregates of every server since `since`, and separately since `recent`"""
+    return db.execute('''
+        SELECT server,
+               SUM(samples), SUM(rate_sum), SUM(rate_square_sum),
+               SUM(CASE WHEN day >= :recent THEN samples ELSE 0 END),
+               SUM(CASE WHEN day >= :recent THEN rate_sum ELSE 0 END),
+               SUM(transitions)
+        FROM daily_rates
+        WHERE day >= :since
+        GROUP BY server
+    ''', {'since': since[:10], 'recent': recent[:10]})
+
+def record_results(db, results):
+    """Append one row per check result in a single transaction"""
+    rows = [
+        (
+            result['name'],
+            result['timestamp'],
+            result.get('status'),
+            int(bool(result.get('available'))),
+            result.get('version'),
+            result.get('pull_count'),
+            result.get('last_updated')
+        )
+        for result in results
+    ]
+    with db:
+        db.executemany(f"INSERT INTO checks VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+        update_rates(db, rows)
+    logging.info(f"Recorded {len(rows)} check results in history")
+    return len(rows)
+
+def query(db, server, since=None, until=None):
+    """Return the check results of one server within [since, until], oldest first"""
+    sql = f"SELECT {', '.join(COLUMNS)} FROM checks WHERE server = ?"
+    params = [server]
+    if since:
+        sql += " AND timestamp >= ?"
+        params.append(since)
+    if until:
+        sql += " AND timestamp <= ?"
+        params.append(until)
+    sql += " ORDER BY timestamp"
+    return [dict(zip(COLUMNS, row)) for row in db.execute(sql, params)]
+
+def query_window(db, since=None, until=None):
+    """Return the check results of every server within [since, until], grouped by server"""
+    sql = f"SELECT {', '.join(COLUMNS)} FROM checks WHERE timestamp >= ? AND timestamp <= ? ORDER BY server, timestamp"
+    history = {}
+    for row in db.execute(sql, (since or '', until or '9999')):
+        record = dict(zip(COLUMNS, row))
+        history.setdefault(record['server'], []).append(record)
+    return history
+
+def status_transitions(db, since, until=None):
+    """Count the status transitions between consecutive raw checks of every server within [since, until]"""
+    return {
+        server: sum(1 for earlier, later in zip(rows, rows[1:]) if earlier['status'] != later['status'])
+        for server, rows in query_window(db, since, until).items()
+    }
+
+def downsample(db, older_than_days=30, bucket='day'):
+    """Keep only the last row per server and bucket for data older than the cutoff"""
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    with db:
+        deleted = db.execute(f'''
+            DELETE FROM checks
+            WHERE timestamp < :cutoff AND rowid NOT IN (
+                SELECT MAX(rowid) FROM checks
+                WHERE timestamp < :cutoff
+                GROUP BY server, {BUCKETS[bucket]}
+            )
+        ''', {'cutoff': cutoff}).rowcount
+    logging.info(f"Downsampled {deleted} history rows older than {older_than_days} days to one per {bucket}")
+    return deleted
+
+def compact(db, older_than_days=30, bucket='day'):
+    """Downsample old data and reclaim the freed space"""
+    deleted = downsample(db, older_than_days, bucket)
+    db.execute('VACUUM')
+    return deleted
+
+def main():
+    """Query or compact the check history from the command line"""
+    parser = argparse.ArgumentParser(description='Query and maintain the MCP server check history')
+    parser.add_argument('--db', default=HISTORY_DB, help=f'History database (default: {HISTORY_DB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    query_parser = subparsers.add_parser('query', help='Print the history of one server as JSON')
+    query_parser.add_argument('server')
+    query_parser.add_argument('--since', help='ISO timestamp lower bound')
+    query_parser.add_argument('--until', help='ISO timestamp upper bound')
+
+    compact_parser = subparsers.add_parser('compact', help='Downsample old rows and vacuum the database')
+    compact_parser.add_argument('--older-than-days', type=int, default=30)
+    compact_parser.add_argument('--bucket', choices=sorted(BUCKETS), default='day')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    db = connect(args.db)
+    try:
+        if args.command == 'query':
+            print(json.dumps(query(db, args.server, args.since, args.until), indent=2))
+        else:
+            compact(db, args.older_than_days, args.bucket)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
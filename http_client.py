@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the MCP server scripts.
+This module:
+1. Keeps one keep-alive connection pool per host (Docker Hub, GitHub, Slack, ...)
+2. Applies a default timeout to every request
+3. Provides the token-bucket rate limiter used for Docker Hub calls
+4. Optionally serves GET requests through the on-disk response cache
+5. Optionally records every response to a cassette, or replays one offline
+6. Retries transient failures of idempotent requests with jittered exponential
+   backoff that honours Retry-After, behind a per-host circuit breaker
+
+Pool sizes, the default timeout and the retry budget can be tuned with the
+HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT and HTTP_MAX_RETRIES
+environment variables, or with configure().
+"""
+
+import os
+import time
+import random
+import logging
+import argparse
+import threading
+import log_setup
+import metrics
+import requests
+import response_cache
+from cassette import Cassette, CassetteMiss
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+# Constants
+POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 4))
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 16))
+DEFAULT_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 10))
+USER_AGENT = 'awesome-docker-mcp-scripts'
+MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', 3))
+RETRY_METHODS = ('GET', 'HEAD')
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_AFTER_MAX = 120.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_cache = None
+_cassette = None
+_breakers = {}
+
+def parse_rate(value):
+    """Parse a requests-per-second limit (RATE > 0) for argparse"""
+    try:
+        rate = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rate '{value}', expected a number")
+    if not 0 < rate < float('inf'):
+        raise argparse.ArgumentTypeError(f"invalid rate '{value}', expected a finite RATE > 0")
+    return rate
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers talking to Docker Hub"""
+
+    def __init__(self, rate=5.0, capacity=None):
+        if rate <= 0:
+            raise ValueError(f"request rate must be positive, got {rate}")
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.capacity = float(capacity or max(1.0, self.max_rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request token is available"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+        if waited:
+            metrics.count('rate_limit_waits')
+            metrics.count('rate_limit_wait_seconds', waited)
+
+    def update_from_headers(self, headers):
+        """Adapt the refill rate to Docker Hub's X-RateLimit-* and Retry-After headers"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            retry_after = headers.get('Retry-After')
+            if retry_after:
+                try:
+                    self.blocked_until = max(self.blocked_until, now + float(retry_after))
+                except ValueError:
+                    pass
+
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset = headers.get('X-RateLimit-Reset')
+            if remaining is None or reset is None:
+                return
+            try:
+                remaining = int(remaining)
+                window = max(0.0, float(reset) - time.time())
+            except ValueError:
+                return
+
+            if remaining <= 0:
+                # Budget exhausted: hold every worker until the window resets
+                self.blocked_until = max(self.blocked_until, now + window)
+                self.tokens = 0.0
+            elif window > 0:
+                # Spread the remaining budget evenly over the rest of the window
+                self.rate = max(0.01, min(self.max_rate, remaining / window))
+                self.tokens = min(self.tokens, float(remaining))
+            else:
+                self.rate = self.max_rate
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without sending when a host's circuit breaker is open"""
+
+class CircuitBreaker:
+    """Per-host breaker that fails fast once a host keeps failing"""
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return whether a request may be sent; after the cooldown one trial request is let through"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.cooldown:
+                self.opened_at = now
+                return True
+            return False
+
+    def record(self, success):
+        """Close the breaker on success; open it after `threshold` consecutive failures"""
+        with self.lock:
+            if success:
+                if self.opened_at is not None:
+                    logging.info(f"Circuit breaker for {self.host} closed")
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    metrics.count('breaker_trips')
+                    logging.warning(f"Circuit breaker for {self.host} opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+def get_breaker(url):
+    """Return the circuit breaker for the host of `url`"""
+    host = urlsplit(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _sessions_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+def configure(pool_connections=None, pool_maxsize=None, timeout=None, max_retries=None):
+    """Tune pool sizes, the default timeout and retries; existing sessions are rebuilt on next use"""
+    global POOL_CONNECTIONS, POOL_MAXSIZE, DEFAULT_TIMEOUT, MAX_RETRIES
+    if max_retries is not None:
+        MAX_RETRIES = int(max_retries)
+    if pool_connections is not None:
+        POOL_CONNECTIONS = int(pool_connections)
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = int(pool_maxsize)
+    if timeout is not None:
+        DEFAULT_TIMEOUT = float(timeout)
+    close_sessions()
+
+def _new_session():
+    """Create a session whose adapter keeps keep-alive connections open"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def get_session(url):
+    """Return the pooled session for the host of `url`"""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _new_session()
+                _sessions[key] = session
+    return session
+
+def close_sessions():
+    """Close every pooled session"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def add_cache_arguments(parser):
+    """Add the response cache command line options to an argparse parser"""
+    parser.add_argument('--cache-file', default=os.environ.get('HTTP_CACHE_FILE', response_cache.DEFAULT_CACHE_FILE),
+                        help=f'On-disk HTTP response cache (default: {response_cache.DEFAULT_CACHE_FILE})')
+    parser.add_argument('--cache-ttl', type=float, default=response_cache.DEFAULT_TTL,
+                        help=f'Seconds a cached response is served without revalidation (default: {response_cache.DEFAULT_TTL})')
+    parser.add_argument('--cache-max-age', type=float, default=response_cache.DEFAULT_MAX_AGE,
+                        help='Seconds an unused cache entry is kept before eviction (default: 7 days)')
+    parser.add_argument('--cache-max-mb', type=float, default=response_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help='Size budget of the cache in MB before LRU eviction (default: 64)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the HTTP response cache')
+
+def enable_cache_from_args(args):
+    """Enable the response cache as configured by add_cache_arguments()"""
+    if args.no_cache:
+        return None
+    if getattr(args, 'record', None) or getattr(args, 'replay', None):
+        # Cached or revalidated responses would make recordings depend on the cache's state
+        logging.info("HTTP response cache disabled while recording or replaying")
+        return None
+    return enable_cache(args.cache_file, args.cache_ttl, args.cache_max_age, int(args.cache_max_mb * 1024 * 1024))
+
+def enable_cache(path=response_cache.DEFAULT_CACHE_FILE, ttl=response_cache.DEFAULT_TTL,
+                 max_age=response_cache.DEFAULT_MAX_AGE, max_bytes=response_cache.DEFAULT_MAX_BYTES):
+    """Serve cacheable GET requests through an on-disk response cache"""
+    global _cache
+    disable_cache()
+    try:
+        _cache = response_cache.ResponseCache(path, ttl, max_age, max_bytes)
+    except Exception as e:
+        logging.warning(f"HTTP response cache disabled: {e}")
+        _cache = None
+    return _cache
+
+def disable_cache():
+    """Flush and close the response cache, logging its hit/miss counts"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+def add_cassette_arguments(parser):
+    """Add the record/replay command line options to an argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', metavar='CASSETTE', help='Record every HTTP response to a cassette file')
+    group.add_argument('--replay', metavar='CASSETTE',
+                       help='Replay HTTP responses from a cassette file without network access')
+    parser.add_argument('--replay-latency', type=float, default=0.0, metavar='MS',
+                        help='Simulated latency per replayed request in milliseconds (default: 0)')
+
+def enable_cassette_from_args(args):
+    """Start recording or replaying as configured by add_cassette_arguments()"""
+    if args.record:
+        return enable_cassette(args.record, 'record')
+    if args.replay:
+        return enable_cassette(args.replay, 'replay', args.replay_latency / 1000)
+    return None
+
+def enable_cassette(path, mode='replay', latency=0.0):
+    """Record responses to, or replay them from, the cassette at `path`"""
+    global _cassette
+    close_cassette()
+    _cassette = Cassette(path, mode, latency)
+    logging.info(f"{'Replaying HTTP responses from' if mode == 'replay' else 'Recording HTTP responses to'} {path}")
+    return _cassette
+
+def close_cassette():
+    """Save a recorded cassette and stop recording or replaying"""
+    global _cassette
+    if _cassette is not None:
+        _cassette.close()
+        _cassette = None
+
+def _send(method, url, limiter=None, **kwargs):
+    """Send a request over the host's pooled session, honouring the rate limiter"""
+    cassette = _cassette
+    start = time.perf_counter()
+    if cassette is not None and cassette.replaying:
+        # Replayed responses need neither the network nor the rate limiter
+        response = cassette.replay(method, url)
+        metrics.observe_request(url, response.status_code, time.perf_counter() - start)
+        return response
+
+    if limiter:
+        limiter.acquire()
+        start = time.perf_counter()
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+    except Exception:
+        metrics.observe_request(url, 'error', time.perf_counter() - start)
+        raise
+    metrics.observe_request(url, response.status_code, time.perf_counter() - start)
+    if cassette is not None:
+        cassette.record(method, url, response)
+    if limiter:
+        limiter.update_from_headers(response.headers)
+    return response
+
+def retry_delay(attempt, response=None):
+    """Jittered exponential backoff for `attempt`, or the server's Retry-After if longer"""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, min(RETRY_AFTER_MAX, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
+
+def _send_with_retries(method, url, limiter=None, **kwargs):
+    """Send a request through the host's circuit breaker, retrying transient failures of idempotent methods"""
+    breaker = get_breaker(url)
+    attempts = 1 + (MAX_RETRIES if method in RETRY_METHODS else 0)
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow():
+            metrics.count('short_circuited')
+            raise CircuitOpenError(f"Circuit breaker open for {breaker.host}")
+
+        response = None
+        try:
+            response = _send(method, url, limiter, **kwargs)
+        except CassetteMiss:
+            raise
+        except requests.RequestException as e:
+            breaker.record(False)
+            if attempt == attempts:
+                raise
+            reason = str(e)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record(True)
+                return response
+            # A 429 means the host is up but throttling us; the token bucket and Retry-After handle it
+            if response.status_code != 429:
+                breaker.record(False)
+            if attempt == attempts:
+                return response
+            reason = f"HTTP {response.status_code}"
+
+        delay = retry_delay(attempt, response)
+        metrics.count('retries')
+        log_setup.request_log.warning("%s %s failed (%s); retry %d/%d in %.1fs", method, url, reason, attempt, attempts - 1, delay)
+        # Replayed failures are followed by their recorded retries, without waiting
+        if _cassette is None or not _cassette.replaying:
+            time.sleep(delay)
+
+def request(method, url, limiter=None, use_cache=True, **kwargs):
+    """Send a request with a default timeout and retries, through the response cache for GETs"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    cache = _cache
+    if cache is not None and use_cache and method == 'GET':
+        headers = kwargs.pop('headers', None)
+        return cache.get(url, lambda headers: _send_with_retries(method, url, limiter, headers=headers, **kwargs), headers)
+    return _send_with_retries(method, url, limiter, **kwargs)
+
+def get(url, **kwargs):
+    """Send a pooled GET request"""
+    return request('GET', url, **kwargs)
+
+def head(url, **kwargs):
+    """Send a pooled HEAD request"""
+    kwargs.setdefault('allow_redirects', False)
+    return request('HEAD', url, **kwargs)
+
+def post(url, **kwargs):
+    """Send a pooled POST request"""
+    return request('POST', url, **kwargs)
+
+def put(url, **kwargs):
+    """Send a pooled PUT request"""
+    return request('PUT', url, **kwargs)
+
+def patch(url, **kwargs):
+    """Send a pooled PATCH request"""
+    return request('PATCH', url, **kwargs)
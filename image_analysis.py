@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Catalog-wide image layer and size analysis for check_mcp_servers.py.
+This module:
+1. Resolves the tracked tag of every online server to its manifest index,
+   per-platform manifests and config blobs, keeping them in a content-addressed
+   on-disk cache so an unchanged digest is never fetched again
+2. Computes the compressed size of every image per platform
+3. Finds the layers shared across images and the bytes saved by pulling them
+   once per host
+4. Flags images whose size grew since the previous run
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import registry
+
+# Constants
+CACHE_DIR = '.manifest_cache'
+REFERENCE_PLATFORM = 'linux/amd64'
+SIZE_REGRESSION_PERCENT = 10.0
+SHARED_LAYERS_LIMIT = 10
+LARGEST_IMAGES_LIMIT = 10
+
+class BlobCache:
+    """Content-addressed store of registry manifests and blobs, verified against their digests"""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.stats = {'hits': 0, 'misses': 0}
+        self.lock = threading.Lock()
+
+    def path(self, digest):
+        algorithm, _, value = digest.partition(':')
+        return os.path.join(self.directory, algorithm, value[:2], value)
+
+    def get(self, digest):
+        """Return the cached bytes of `digest`, or None"""
+        try:
+            with open(self.path(digest), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, digest, data):
+        """Store `data` under `digest` after checking that it hashes to it"""
+        algorithm, _, value = digest.partition(':')
+        if algorithm != 'sha256' or hashlib.sha256(data).hexdigest() != value:
+            raise ValueError(f"Content does not match digest {digest}")
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.blob.', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def fetch(self, client, name, kind, digest, limiter=None):
+        """Return the bytes of a manifest or blob, from the cache or else from the registry"""
+        data = self.get(digest)
+        with self.lock:
+            self.stats['hits' if data is not None else 'misses'] += 1
+        if data is None:
+            data = client.get_blob(name, kind, digest, limiter)
+            self.put(digest, data)
+        return data
+
+def analyze_image(client, cache, name, digest=None, limiter=None):
+    """Return the per-platform size and layers of one image's tracked tag, or None if the tag does not exist"""
+    tag = client.tags[0]
+    if digest is None:
+        digest, _ = client.head_manifest(name, tag, limiter)
+        if digest is None:
+            return None
+
+    top = json.loads(cache.fetch(client, name, 'manifests', digest, limiter))
+    if 'manifests' in top:
+        entries = registry.index_platforms(top).items()
+    else:
+        entries = [(None, digest)]
+
+    platforms = {}
+    for platform, manifest_digest in entries:
+        manifest = top if manifest_digest == digest else json.loads(
+            cache.fetch(client, name, 'manifests', manifest_digest, limiter))
+        config = json.loads(cache.fetch(client, name, 'blobs', manifest['config']['digest'], limiter))
+        platform = platform or f"{config.get('os', 'unknown')}/{config.get('architecture', 'unknown')}"
+        layers = [(layer['digest'], layer['size']) for layer in manifest.get('layers', [])]
+        platforms[platform] = {
+            'size': manifest['config']['size'] + sum(size for _, size in layers),
+            'layers': layers
+        }
+    return {'tag': tag, 'digest': digest, 'platforms': platforms}
+
+def reference_platform(image):
+    """Platform whose size represents the image: linux/amd64 when available"""
+    if REFERENCE_PLATFORM in image['platforms']:
+        return REFERENCE_PLATFORM
+    return next(iter(sorted(image['platforms'])), None)
+
+def analyze_catalog(client, cache, servers_status, concurrency=8, limiter=None):
+    """Analyze the tracked tag of every online server; return the analyses keyed by server name"""
+    tag = client.tags[0]
+    names = [name for name, data in servers_status.items() if data.get('status') == 'online']
+    client.authorize(names)
+
+    def analyze(name):
+        # Digests already read this run (or carried over) save the HEAD request
+        digest = (servers_status[name].get('digests') or {}).get(tag, {}).get('digest')
+        try:
+            return analyze_image(client, cache, name, digest, limiter)
+        except Exception as e:
+            logging.warning(f"Could not analyze the {tag} image of {name}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = dict(zip(names, executor.map(analyze, names)))
+    images = {name: image for name, image in results.items() if image and image['platforms']}
+    logging.info(f"Analyzed {len(images)} images, {cache.stats['hits']} cached and {cache.stats['misses']} fetched manifests and blobs")
+    return images
+
+def record_images(servers_status, images):
+    """Return the status with each analyzed server's image digest and sizes attached"""
+    status = {}
+    for name, data in servers_status.items():
+        image = images.get(name)
+        if image is None:
+            status[name] = data
+            continue
+        platform = reference_platform(image)
+        status[name] = dict(data, image={
+            'tag': image['tag'],
+            'digest': image['digest'],
+            'size': image['platforms'][platform]['size'],
+            'platforms': {key: value['size'] for key, value in sorted(image['platforms'].items())}
+        })
+    return status
+
+def summarize(images):
+    """Catalog-wide totals, the most shared layers and the largest images on the reference platforms"""
+    layers = {}
+    sizes = {}
+    for name, image in images.items():
+        platform = image['platforms'][reference_platform(image)]
+        sizes[name] = platform['size']
+        for digest, size in platform['layers']:
+            layer = layers.setdefault(digest, {'digest': digest, 'size': size, 'images': 0})
+            layer['images'] += 1
+
+    shared = [layer for layer in layers.values() if layer['images'] > 1]
+    shared.sort(key=lambda layer: (-layer['size'] * (layer['images'] - 1), layer['digest']))
+    largest = sorted(sizes.items(), key=lambda item: (-item[1], item[0]))[:LARGEST_IMAGES_LIMIT]
+    total = sum(sizes.values())
+    saved = sum(layer['size'] * (layer['images'] - 1) for layer in shared)
+    return {
+        'images': len(images),
+        'total_size': total,
+        'deduplicated_size': total - saved,
+        'shared_layers': shared[:SHARED_LAYERS_LIMIT],
+        'shared_layer_count': len(shared),
+        'largest': [{'server': name, 'size': size} for name, size in largest]
+    }
+
+def size_changes(server_name, previous, current):
+    """Return an image_size change when a new image grew by SIZE_REGRESSION_PERCENT or more"""
+    earlier = previous.get('image')
+    image = current.get('image')
+    if not earlier or not image or earlier['digest'] == image['digest'] or not earlier['size']:
+        return []
+    percentage = (image['size'] - earlier['size']) / earlier['size'] * 100
+    if percentage < SIZE_REGRESSION_PERCENT:
+        return []
+    return [{
+        'server': server_name,
+        'type': 'image_size',
+        'previous': earlier['size'],
+        'current': image['size'],
+        'percentage': round(percentage, 2)
+    }]
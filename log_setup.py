@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Asynchronous structured logging for the MCP server scripts.
+This module:
+1. Puts every log record on a queue and writes it from a background listener
+   thread, so file and console I/O stay off the request path
+2. Writes the log file as JSON lines (or the classic text format), rotated
+   by size
+3. Samples the per-request messages of the `mcp.requests` logger per level,
+   recording the sample rate on each kept record
+
+Nothing is configured at import time; the scripts call configure_from_args()
+from main(), so importing them as a library has no logging side effects.
+"""
+
+import json
+import math
+import queue
+import atexit
+import argparse
+import logging
+import itertools
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Constants
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_FORMATS = ('json', 'text')
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+REQUEST_LOGGER = 'mcp.requests'
+
+# Logger for messages emitted once per request or per server
+request_log = logging.getLogger(REQUEST_LOGGER)
+
+_listener = None
+_queue_handler = None
+_lock = threading.Lock()
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if hasattr(record, 'sample_rate'):
+            entry['sample_rate'] = record.sample_rate
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+class SamplingFilter(logging.Filter):
+    """Keeps exactly `rate` of the records of each sampled level, spread evenly"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self.counters = {level: itertools.count() for level in rates}
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        record.sample_rate = rate
+        # Keep a record whenever the accumulated rate crosses an integer; computing the total from the
+        # record count rather than summing floats keeps exactly ceil(n * rate) of the first n records
+        count = next(self.counters[record.levelno])
+        return math.ceil(round((count + 1) * rate, 9)) > math.ceil(round(count * rate, 9))
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues records unformatted so message formatting also happens on the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+def parse_sample(value):
+    """Parse a `LEVEL=RATE` sampling option (0 <= RATE <= 1) for argparse"""
+    level, _, rate = value.partition('=')
+    levelno = logging.getLevelName(level.strip().upper())
+    try:
+        rate = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid sample '{value}', expected LEVEL=RATE")
+    if not isinstance(levelno, int) or not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(f"invalid sample '{value}', expected LEVEL=RATE with 0 <= RATE <= 1")
+    return levelno, rate
+
+def configure(log_file=None, log_format='json', console=True, level=logging.INFO, max_bytes=DEFAULT_MAX_BYTES,
+              backup_count=DEFAULT_BACKUP_COUNT, sample_rates=None):
+    """Route all logging through a queue to the console and/or a rotating log file"""
+    global _listener, _queue_handler
+    shutdown()
+
+    handlers = []
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8',
+                                           delay=True)
+        file_handler.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+
+    records = queue.SimpleQueue()
+    with _lock:
+        _queue_handler = DeferredQueueHandler(records)
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+
+    for existing in list(request_log.filters):
+        request_log.removeFilter(existing)
+    if sample_rates:
+        request_log.addFilter(SamplingFilter(dict(sample_rates)))
+
+def shutdown():
+    """Write out the queued records and detach the queue handler"""
+    global _listener, _queue_handler
+    with _lock:
+        listener, handler = _listener, _queue_handler
+        _listener = _queue_handler = None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for target in listener.handlers:
+            target.close()
+
+atexit.register(shutdown)
+
+def add_arguments(parser, log_file=None):
+    """Add the logging command line options to an argparse parser"""
+    parser.add_argument('--log-file', default=log_file,
+                        help=f'Log file, rotated by size; empty for console only (default: {log_file or "none"})')
+    parser.add_argument('--log-format', choices=LOG_FORMATS, default='json',
+                        help='Log file format (default: json, one object per line)')
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='Minimum level logged (default: INFO)')
+    parser.add_argument('--log-max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help=f'Rotate the log file at this size; 0 never rotates (default: {DEFAULT_MAX_BYTES})')
+    parser.add_argument('--log-backups', type=int, default=DEFAULT_BACKUP_COUNT,
+                        help=f'Rotated log files kept (default: {DEFAULT_BACKUP_COUNT})')
+    parser.add_argument('--log-sample', action='append', type=parse_sample, metavar='LEVEL=RATE',
+                        help='Keep only this fraction of per-request messages at LEVEL, e.g. INFO=0.1; repeatable')
+
+def configure_from_args(args):
+    """Configure logging from the options added by add_arguments()"""
+    configure(args.log_file, args.log_format, level=getattr(logging, args.log_level), max_bytes=args.log_max_bytes,
+              backup_count=args.log_backups, sample_rates=args.log_sample)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+MCP protocol-level health probe for check_mcp_servers.py.
+This module:
+1. Pulls each server's image, then launches the server as a stdio subprocess
+   from a configurable command template (by default a named
+   `docker run -i --rm --pull=never` container, so the timer never includes
+   a pull) and force-removes the container afterwards, so a hung or killed
+   probe never leaks one
+2. Performs the MCP `initialize` + `tools/list` handshake over JSON-RPC,
+   measuring the cold start (launch to initialize result) and the first
+   response (tools/list round trip)
+3. Runs the probes on a bounded worker pool with a timeout per probe
+4. Flags servers that stop answering MCP or whose cold start regresses
+   against a moving baseline
+"""
+
+import time
+import json
+import uuid
+import queue
+import shlex
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Constants
+DEFAULT_COMMAND = 'docker run -i --rm --pull=never --name {container} {image}'
+DEFAULT_PULL_COMMAND = 'docker pull --quiet {image}'
+DEFAULT_CLEANUP_COMMAND = 'docker rm -f {container}'
+DEFAULT_TIMEOUT = 60.0
+PULL_TIMEOUT = 600.0
+DEFAULT_WORKERS = 2
+PROTOCOL_VERSION = '2024-11-05'
+CLIENT_INFO = {'name': 'awesome-docker-mcp-check', 'version': '1.0'}
+SHUTDOWN_GRACE = 5.0
+BASELINE_WEIGHT = 0.2
+LATENCY_REGRESSION_FACTOR = 2.0
+MIN_LATENCY_REGRESSION = 1.0
+
+class ProbeError(Exception):
+    """Raised when a server does not complete the MCP handshake"""
+
+class StdioSession:
+    """JSON-RPC over the stdin/stdout of a subprocess, with a reader thread so reads can time out"""
+
+    def __init__(self, argv, cleanup=None):
+        self.cleanup = cleanup
+        self.process = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def send(self, message):
+        self.process.stdin.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.process.stdin.flush()
+
+    def response(self, request_id, deadline):
+        """Wait for the response to `request_id`, skipping notifications and log lines"""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"no response to request {request_id}")
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"no response to request {request_id}")
+            if line is None:
+                raise ProbeError(f"server closed stdout before responding (exit code {self.exit_code()})")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get('id') == request_id:
+                if 'error' in message:
+                    raise ProbeError(f"{message['error'].get('message', 'error')} (code {message['error'].get('code')})")
+                return message.get('result') or {}
+
+    def exit_code(self):
+        try:
+            return self.process.wait(SHUTDOWN_GRACE)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def close(self):
+        """Close stdin so the server exits, killing it if it does not, then run the cleanup command"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(SHUTDOWN_GRACE)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+        # Killing the `docker run` client leaves its container running; remove it by name
+        if self.cleanup:
+            try:
+                subprocess.run(self.cleanup, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               timeout=SHUTDOWN_GRACE * 2)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logging.warning(f"Probe cleanup `{shlex.join(self.cleanup)}` failed: {e}")
+
+def probe_command(template, server_name, container=None):
+    """Build the argv of a probe command from its template, or None for an empty template"""
+    if not template:
+        return None
+    return shlex.split(template.format(name=server_name, image=f"mcp/{server_name}", container=container))
+
+def pull_image(argv):
+    """Run the pull command before the timer starts; raise ProbeError if it fails"""
+    try:
+        completed = subprocess.run(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   timeout=PULL_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        raise ProbeError(f"pull did not finish within {PULL_TIMEOUT:g}s")
+    if completed.returncode != 0:
+        message = completed.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise ProbeError(f"pull failed: {message[-1] if message else f'exit code {completed.returncode}'}")
+
+def probe_server(server_name, command=DEFAULT_COMMAND, timeout=DEFAULT_TIMEOUT, pull_command=DEFAULT_PULL_COMMAND,
+                 cleanup_command=DEFAULT_CLEANUP_COMMAND):
+    """Pull the image, launch one server and run the MCP handshake; return the probe result"""
+    result = {
+        'status': 'failed',
+        'cold_start': None,
+        'first_response': None,
+        'tools': None,
+        'server_version': None,
+        'error': None,
+        'timestamp': datetime.now().isoformat()
+    }
+    container = f"mcp-probe-{server_name}-{uuid.uuid4().hex[:8]}"
+    session = None
+    try:
+        pull = probe_command(pull_command, server_name, container)
+        if pull:
+            pull_image(pull)
+
+        start = time.monotonic()
+        deadline = start + timeout
+        session = StdioSession(probe_command(command, server_name, container),
+                               probe_command(cleanup_command, server_name, container))
+        session.send({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {
+            'protocolVersion': PROTOCOL_VERSION, 'capabilities': {}, 'clientInfo': CLIENT_INFO
+        }})
+        initialized = session.response(1, deadline)
+        result['cold_start'] = round(time.monotonic() - start, 3)
+        result['server_version'] = (initialized.get('serverInfo') or {}).get('version')
+
+        session.send({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        sent = time.monotonic()
+        session.send({'jsonrpc': '2.0', 'id': 2, 'method': 'tools/list', 'params': {}})
+        tools = session.response(2, deadline)
+        result['first_response'] = round(time.monotonic() - sent, 3)
+        result['tools'] = len(tools.get('tools', []))
+        result['status'] = 'ok'
+    except TimeoutError as e:
+        result['status'] = 'timeout'
+        result['error'] = f"{e} within {timeout:g}s"
+    except (ProbeError, OSError, ValueError) as e:
+        result['error'] = str(e)
+    finally:
+        if session is not None:
+            session.close()
+
+    if result['status'] != 'ok':
+        logging.warning(f"MCP probe of {server_name} {result['status']}: {result['error']}")
+    return result
+
+def probe_servers(server_names, command=DEFAULT_COMMAND, timeout=DEFAULT_TIMEOUT, workers=DEFAULT_WORKERS,
+                  pull_command=DEFAULT_PULL_COMMAND, cleanup_command=DEFAULT_CLEANUP_COMMAND):
+    """Probe servers on at most `workers` concurrent subprocesses; return the results keyed by server name"""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda name: probe_server(name, command, timeout, pull_command, cleanup_command),
+                               server_names)
+        probes = dict(zip(server_names, results))
+    passed = sum(1 for probe in probes.values() if probe['status'] == 'ok')
+    logging.info(f"MCP probes: {passed} of {len(probes)} servers completed the handshake")
+    return probes
+
+def update_baseline(probe, previous):
+    """Carry the cold start baseline forward as an exponentially weighted moving average"""
+    baseline = (previous or {}).get('baseline')
+    if probe['status'] == 'ok':
+        cold_start = probe['cold_start']
+        baseline = cold_start if baseline is None else round(baseline + BASELINE_WEIGHT * (cold_start - baseline), 3)
+    probe['baseline'] = baseline
+    return probe
+
+def probe_changes(server_name, previous, current):
+    """Return handshake failures, recoveries and cold start regressions of one server"""
+    earlier = previous.get('probe')
+    probe = current.get('probe')
+    if not earlier or not probe or probe['timestamp'] == earlier['timestamp']:
+        return []
+    if probe['status'] != earlier['status'] and 'ok' in (probe['status'], earlier['status']):
+        return [{
+            'server': server_name,
+            'type': 'probe',
+            'previous': earlier['status'],
+            'current': probe['status']
+        }]
+    baseline = earlier.get('baseline')
+    if probe['status'] == 'ok' and baseline:
+        cold_start = probe['cold_start']
+        if cold_start >= baseline * LATENCY_REGRESSION_FACTOR and cold_start - baseline >= MIN_LATENCY_REGRESSION:
+            return [{
+                'server': server_name,
+                'type': 'startup_latency',
+                'previous': baseline,
+                'current': cold_start,
+                'percentage': round((cold_start - baseline) / baseline * 100, 2)
+            }]
+    return []
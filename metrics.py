@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation for the MCP server scripts.
+This module:
+1. Records how long each phase of a run takes (README parsing, Docker Hub
+   calls, rendering, notification, GitHub push, ...)
+2. Keeps per-request latency histograms by endpoint and status code, plus
+   retry, circuit breaker and rate-limit wait counters
+3. Exports everything as a Prometheus textfile and a JSON summary
+4. Optionally profiles a single run with cProfile
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# Constants
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNTERS = ('retries', 'breaker_trips', 'short_circuited', 'rate_limit_waits', 'rate_limit_wait_seconds')
+
+_lock = threading.Lock()
+_state = {}
+_profiler = None
+
+def reset(script=None):
+    """Clear all recorded metrics"""
+    with _lock:
+        _state.clear()
+        _state.update({
+            'script': script,
+            'started': time.time(),
+            'phases': {},
+            'requests': {},
+            'counters': {name: 0 for name in COUNTERS}
+        })
+
+reset()
+
+@contextmanager
+def phase(name):
+    """Time a phase of the run; repeated phases accumulate"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _state['phases'][name] = _state['phases'].get(name, 0.0) + elapsed
+
+def count(name, value=1):
+    """Add `value` to a counter"""
+    with _lock:
+        _state['counters'][name] = _state['counters'].get(name, 0) + value
+
+def endpoint_for(url):
+    """Map a request URL to a low-cardinality endpoint label"""
+    parts = urlsplit(url)
+    path = [part for part in parts.path.split('/') if part]
+    if path[:2] == ['v2', 'repositories']:
+        if len(path) <= 3:
+            return 'hub_namespace'
+        return 'hub_tags' if path[-1] == 'tags' else 'hub_repository'
+    if path[:1] == ['v2'] and len(path) > 2 and path[-2] == 'manifests':
+        return 'registry_manifest'
+    if path == ['v2']:
+        return 'registry_base'
+    if path[-1:] == ['token']:
+        return 'registry_token'
+    if path[:2] == ['r', 'mcp']:
+        return 'hub_page'
+    if path[:1] == ['repos']:
+        return f"github_{path[3]}" if len(path) > 3 else 'github_repo'
+    if parts.netloc.endswith('slack.com'):
+        return 'slack'
+    return parts.netloc or 'unknown'
+
+def observe_request(url, status, seconds):
+    """Record one request's latency under its endpoint and status code"""
+    key = (endpoint_for(url), str(status))
+    with _lock:
+        histogram = _state['requests'].get(key)
+        if histogram is None:
+            histogram = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+            _state['requests'][key] = histogram
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram['buckets'][index] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+def summary():
+    """Return the recorded metrics as a JSON-serialisable dict"""
+    with _lock:
+        return {
+            'script': _state['script'],
+            'timestamp': datetime.now().isoformat(),
+            'duration_seconds': round(time.time() - _state['started'], 6),
+            'phases': {name: round(seconds, 6) for name, seconds in _state['phases'].items()},
+            'counters': dict(_state['counters']),
+            'requests': [
+                {
+                    'endpoint': endpoint,
+                    'status': status,
+                    'count': histogram['count'],
+                    'sum_seconds': round(histogram['sum'], 6),
+                    'mean_seconds': round(histogram['sum'] / histogram['count'], 6),
+                    'buckets': dict(zip(map(str, LATENCY_BUCKETS), histogram['buckets']))
+                }
+                for (endpoint, status), histogram in sorted(_state['requests'].items())
+            ]
+        }
+
+def render_prometheus():
+    """Render the recorded metrics in the Prometheus text exposition format"""
+    data = summary()
+    script = data['script'] or 'unknown'
+    lines = [
+        '# HELP mcp_run_duration_seconds Wall-clock duration of the run',
+        '# TYPE mcp_run_duration_seconds gauge',
+        f'mcp_run_duration_seconds{{script="{script}"}} {data["duration_seconds"]}',
+        '# HELP mcp_phase_duration_seconds Duration of each phase of the run',
+        '# TYPE mcp_phase_duration_seconds gauge'
+    ]
+    for name, seconds in data['phases'].items():
+        lines.append(f'mcp_phase_duration_seconds{{script="{script}",phase="{name}"}} {seconds}')
+
+    lines.append('# HELP mcp_http_request_duration_seconds HTTP request latency by endpoint and status code')
+    lines.append('# TYPE mcp_http_request_duration_seconds histogram')
+    for request in data['requests']:
+        labels = f'script="{script}",endpoint="{request["endpoint"]}",code="{request["status"]}"'
+        for bound, bucket_count in request['buckets'].items():
+            lines.append(f'mcp_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket_count}')
+        lines.append(f'mcp_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {request["count"]}')
+        lines.append(f'mcp_http_request_duration_seconds_sum{{{labels}}} {request["sum_seconds"]}')
+        lines.append(f'mcp_http_request_duration_seconds_count{{{labels}}} {request["count"]}')
+
+    for name, value in data['counters'].items():
+        lines.append(f'# TYPE mcp_{name}_total counter')
+        lines.append(f'mcp_{name}_total{{script="{script}"}} {round(value, 6)}')
+    return '\n'.join(lines) + '\n'
+
+def _write_atomic(path, content):
+    """Write a file via a temporary file and rename, as Prometheus textfile collectors expect"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.metrics.', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+def add_arguments(parser, prefix):
+    """Add the metrics and profiling command line options to an argparse parser"""
+    parser.add_argument('--metrics-json', default=f'{prefix}_metrics.json',
+                        help=f'JSON metrics summary (default: {prefix}_metrics.json)')
+    parser.add_argument('--metrics-prom', default=f'{prefix}_metrics.prom',
+                        help=f'Prometheus textfile (default: {prefix}_metrics.prom)')
+    parser.add_argument('--no-metrics', action='store_true', help='Do not write metrics files')
+    parser.add_argument('--profile', metavar='FILE', help='Profile the run with cProfile and save the stats to FILE')
+
+def start(args, script):
+    """Reset metrics and start the profiler if requested"""
+    global _profiler
+    reset(script)
+    if getattr(args, 'profile', None):
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+def finish(args):
+    """Stop the profiler and write the metrics files"""
+    global _profiler
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(args.profile)
+        logging.info(f"Profile written to {args.profile}")
+        _profiler = None
+
+    with _lock:
+        counters = dict(_state['counters'])
+    if counters['retries'] or counters['breaker_trips']:
+        logging.warning(f"HTTP retries: {counters['retries']}, circuit breaker trips: {counters['breaker_trips']}, "
+                        f"requests failed fast: {counters['short_circuited']}")
+
+    if args.no_metrics:
+        return
+    try:
+        _write_atomic(args.metrics_json, json.dumps(summary(), indent=2))
+        _write_atomic(args.metrics_prom, render_prometheus())
+        logging.info(f"Metrics written to {args.metrics_json} and {args.metrics_prom}")
+    except Exception as e:
+        logging.error(f"Error writing metrics: {e}")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Background notification dispatcher for check_mcp_servers.py.
+This module:
+1. Queues change events so the check pipeline never waits on SMTP or Slack
+2. Merges bursts of changes that arrive within the digest window into one digest
+3. Sends the digest to email and Slack concurrently, with timeouts and
+   jittered exponential backoff between attempts
+4. Splits Slack messages so they stay within Slack's block limits
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import http_client
+
+# Constants
+SMTP_SERVER = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
+SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+SMTP_TIMEOUT = 30
+SLACK_TIMEOUT = 10
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+DEFAULT_DIGEST_WINDOW = 60.0
+SLACK_TEXT_LIMIT = 3000
+SLACK_MAX_BLOCKS = 50
+
+_STOP = object()
+
+def merge_changes(batches):
+    """Merge change lists from several cycles into one digest, keeping the earliest previous value"""
+    merged = {}
+    for changes in batches:
+        for change in changes:
+            key = (change['server'], change['type'], change.get('tag'))
+            earlier = merged.pop(key, None)
+            if earlier is not None and 'previous' in earlier:
+                change = dict(change, previous=earlier['previous'])
+                if change['type'] == 'pull_count' and change['previous']:
+                    change['percentage'] = round((change['current'] - change['previous']) / change['previous'] * 100, 2)
+            merged[key] = change
+
+    # Drop changes that were reverted within the burst
+    return [
+        change for change in merged.values()
+        if change['type'] not in ('status', 'version', 'digest', 'probe') or change['previous'] != change['current']
+    ]
+
+def split_text(text, limit):
+    """Split text on line boundaries into chunks of at most `limit` characters"""
+    chunks = []
+    current = ''
+    for line in text.splitlines():
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            candidate = line
+        current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+def slack_payloads(formatted_output, output_format):
+    """Build Slack messages of at most SLACK_MAX_BLOCKS blocks and SLACK_TEXT_LIMIT characters per section"""
+    title = f"MCP Server Status Changes - {datetime.now().strftime('%Y-%m-%d')}"
+    if output_format == 'markdown':
+        sections = split_text(formatted_output, SLACK_TEXT_LIMIT)
+    else:
+        sections = [f"```\n{chunk}\n```" for chunk in split_text(formatted_output, SLACK_TEXT_LIMIT - 8)]
+
+    per_message = SLACK_MAX_BLOCKS - 1
+    groups = [sections[index:index + per_message] for index in range(0, len(sections), per_message)]
+    payloads = []
+    for number, group in enumerate(groups, 1):
+        header = title if len(groups) == 1 else f"{title} ({number}/{len(groups)})"
+        payloads.append({
+            "text": "MCP Server Status Update",
+            "blocks": [{"type": "header", "text": {"type": "plain_text", "text": header}}] + [
+                {"type": "section", "text": {"type": "mrkdwn", "text": section}} for section in group
+            ]
+        })
+    return payloads
+
+def send_email(recipient, formatted_output, output_format):
+    """Send the digest by email over a single SMTP connection"""
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
+    msg = MIMEMultipart()
+    msg['Subject'] = f"MCP Server Status Changes - {datetime.now().strftime('%Y-%m-%d')}"
+    msg['From'] = SMTP_USERNAME
+    msg['To'] = recipient
+
+    if output_format == 'markdown':
+        # Convert markdown to HTML
+        import markdown
+        html_content = markdown.markdown(formatted_output)
+        msg.attach(MIMEText(html_content, 'html'))
+    msg.attach(MIMEText(formatted_output, 'plain'))
+
+    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT) as server:
+        server.starttls()
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        server.send_message(msg)
+    logging.info(f"Email notification sent to {recipient}")
+
+def post_slack(webhook, payload):
+    """Post one Slack message"""
+    response = http_client.post(
+        webhook,
+        data=json.dumps(payload),
+        headers={'Content-Type': 'application/json'},
+        timeout=SLACK_TIMEOUT
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code} - {response.text}")
+
+def deliver_email(recipient, formatted_output, output_format):
+    """Email the digest, retrying on failure"""
+    with_retries('email', send_email, recipient, formatted_output, output_format)
+
+def deliver_slack(webhook, formatted_output, output_format):
+    """Post the digest to Slack, retrying each split message on its own"""
+    payloads = slack_payloads(formatted_output, output_format)
+    sent = sum(with_retries('Slack', post_slack, webhook, payload) for payload in payloads)
+    if sent == len(payloads):
+        logging.info("Slack notification sent successfully")
+
+def with_retries(channel, send, *args):
+    """Call `send` until it succeeds, backing off exponentially with jitter between attempts"""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            send(*args)
+            return True
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS:
+                logging.error(f"Failed to send {channel} notification after {attempt} attempts: {e}")
+                return False
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            logging.warning(f"Failed to send {channel} notification (attempt {attempt}): {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+class NotificationDispatcher:
+    """Queues change events and delivers them as digests on a background thread"""
+
+    def __init__(self, render, output_format='markdown', email=None, slack_webhook=None,
+                 digest_window=DEFAULT_DIGEST_WINDOW):
+        self.render = render
+        self.output_format = output_format
+        self.channels = []
+        if email:
+            if SMTP_USERNAME and SMTP_PASSWORD:
+                self.channels.append((deliver_email, email))
+            else:
+                logging.warning("Email notification enabled but SMTP credentials not provided")
+        if slack_webhook:
+            self.channels.append((deliver_slack, slack_webhook))
+        self.digest_window = digest_window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='notifier', daemon=True)
+        self._thread.start()
+
+    def submit(self, changes, servers_status, body=None):
+        """Queue one cycle's changes, with its already rendered report if any; returns immediately"""
+        if changes:
+            self._queue.put((changes, servers_status, body))
+
+    def close(self, timeout=None):
+        """Deliver anything still queued without waiting for the digest window, then stop"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logging.warning(f"Notifications still pending after {timeout}s; giving up")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            # Collect everything that arrives within the digest window into one digest
+            batches = [item]
+            deadline = time.monotonic() + self.digest_window
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batches.append(item)
+
+            try:
+                self._dispatch(batches)
+            except Exception as e:
+                logging.error(f"Error dispatching notifications: {e}")
+
+    def _dispatch(self, batches):
+        changes = merge_changes(batch[0] for batch in batches)
+        if not changes or not self.channels:
+            return
+
+        # A single cycle's report was already rendered alongside the printed one; only digests need rendering
+        _, servers_status, body = batches[-1]
+        formatted_output = body if len(batches) == 1 and body else self.render(servers_status, changes, self.output_format)
+        logging.info(f"Dispatching a digest of {len(changes)} changes from {len(batches)} cycles")
+
+        # Deliver to every channel concurrently so a slow one does not hold up the others
+        with ThreadPoolExecutor(max_workers=len(self.channels)) as executor:
+            for deliver, target in self.channels:
+                executor.submit(deliver, target, formatted_output, self.output_format)
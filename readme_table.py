@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Single-pass parser and splice-based rewriter for the README.md server table.
+This module:
+1. Walks the README once and records every server row's span and cells
+2. Rebuilds the document in one pass from (span, new row) replacements
+
+Rows are addressed by their position in the document, so two textually
+identical rows are never confused with each other.
+"""
+
+ROW_CELLS = 5
+
+def parse_table_rows(content):
+    """Return every `| # | name | description | pulls | link |` row with its span"""
+    rows = []
+    start = 0
+    length = len(content)
+
+    while start < length:
+        end = content.find('\n', start)
+        if end == -1:
+            end = length
+        first_pipe = content.find('|', start, end)
+        if first_pipe != -1 and not content[start:first_pipe].strip():
+            row = _parse_row(content[first_pipe:end], first_pipe)
+            if row:
+                rows.append(row)
+        start = end + 1
+
+    return rows
+
+def _parse_row(segment, offset):
+    """Parse a line starting at its first pipe into a row, or None if it is not a server row"""
+    parts = segment.split('|', ROW_CELLS + 1)
+    if len(parts) < ROW_CELLS + 2:
+        return None
+
+    cells = parts[1:ROW_CELLS + 1]
+    if not all(cells) or not cells[0].strip().isdigit():
+        return None
+
+    line = '|' + '|'.join(cells) + '|'
+    return {
+        'index': cells[0].strip(),
+        'server_name': cells[1].strip(),
+        'description': cells[2].strip(),
+        'pull_count': cells[3].strip(),
+        'link': cells[4].strip(),
+        'span': (offset, offset + len(line)),
+        'line': line
+    }
+
+def format_row(index, server_name, description, pull_count, link):
+    """Render a server table row in the README's cell layout"""
+    return f"| {index} | {server_name} | {description} | {pull_count} | {link} |"
+
+def splice_rows(content, replacements):
+    """Build a new document from `(span, text)` replacements in a single pass"""
+    pieces = []
+    position = 0
+    for (start, end), text in sorted(replacements, key=lambda replacement: replacement[0][0]):
+        pieces.append(content[position:start])
+        pieces.append(text)
+        position = end
+    pieces.append(content[position:])
+    return ''.join(pieces)
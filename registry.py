@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Docker registry v2 manifest digest lookups for the MCP server images.
+This module:
+1. Issues one HEAD request per tracked tag against the registry's manifest
+   endpoint and reads the content digest from the Docker-Content-Digest header
+2. Resolves the per-platform digests of multi-arch indexes, fetching an index
+   body only when its digest changed since the last run
+3. Authenticates with the bearer token flow of the registry, requesting one
+   token for a whole batch of repositories instead of one per repository
+"""
+
+import re
+import json
+import time
+import logging
+import threading
+import requests
+from urllib.parse import urlencode
+import http_client
+import log_setup
+
+# Constants
+REGISTRY_URL = 'https://registry-1.docker.io'
+NAMESPACE = 'mcp'
+DEFAULT_TAGS = ('latest',)
+TOKEN_BATCH_SIZE = 50
+TOKEN_EXPIRY_MARGIN = 30
+INDEX_MEDIA_TYPES = (
+    'application/vnd.oci.image.index.v1+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json'
+)
+MANIFEST_MEDIA_TYPES = (
+    'application/vnd.oci.image.manifest.v1+json',
+    'application/vnd.docker.distribution.manifest.v2+json'
+)
+MANIFEST_ACCEPT = ', '.join(INDEX_MEDIA_TYPES + MANIFEST_MEDIA_TYPES)
+CHALLENGE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+def platform_key(platform):
+    """Return `os/architecture[/variant]` for a manifest index entry's platform"""
+    key = f"{platform.get('os', 'unknown')}/{platform.get('architecture', 'unknown')}"
+    return f"{key}/{platform['variant']}" if platform.get('variant') else key
+
+def index_platforms(index):
+    """Map the platforms of a manifest index to their digests, skipping attestation manifests"""
+    platforms = {}
+    for manifest in index.get('manifests', []):
+        platform = manifest.get('platform') or {}
+        annotations = manifest.get('annotations') or {}
+        if platform.get('os') == 'unknown' or 'vnd.docker.reference.type' in annotations:
+            continue
+        platforms[platform_key(platform)] = manifest['digest']
+    return platforms
+
+class RegistryClient:
+    """Manifest digest lookups against one registry, sharing bearer tokens between threads"""
+
+    def __init__(self, registry_url=REGISTRY_URL, namespace=NAMESPACE, tags=DEFAULT_TAGS, cache=None):
+        self.registry_url = registry_url.rstrip('/')
+        self.namespace = namespace
+        self.tags = tuple(tags)
+        self.cache = cache
+        self.tokens = {}
+        self.challenge = None
+        self.lock = threading.Lock()
+
+    def _repository(self, name):
+        return f"{self.namespace}/{name}"
+
+    def _discover(self):
+        """Read the token realm from the registry's /v2/ challenge; an empty challenge means no auth"""
+        if self.challenge is None:
+            response = http_client.get(f"{self.registry_url}/v2/", use_cache=False)
+            header = response.headers.get('WWW-Authenticate', '')
+            if response.status_code == 401 and header.lower().startswith('bearer '):
+                self.challenge = dict(CHALLENGE_PATTERN.findall(header))
+            else:
+                self.challenge = {}
+        return self.challenge
+
+    def authorize(self, names):
+        """Request pull tokens for `names`, one token request per TOKEN_BATCH_SIZE repositories"""
+        challenge = self._discover()
+        if not challenge.get('realm'):
+            return
+        now = time.monotonic()
+        pending = [name for name in names if self.tokens.get(name, (None, 0))[1] <= now]
+        for start in range(0, len(pending), TOKEN_BATCH_SIZE):
+            batch = pending[start:start + TOKEN_BATCH_SIZE]
+            params = [('service', challenge.get('service', ''))]
+            params.extend(('scope', f"repository:{self._repository(name)}:pull") for name in batch)
+            response = http_client.get(f"{challenge['realm']}?{urlencode(params)}", use_cache=False)
+            if response.status_code != 200:
+                logging.warning(f"Registry token request returned status code {response.status_code}")
+                continue
+            data = response.json()
+            token = data.get('token') or data.get('access_token')
+            expires = time.monotonic() + max(0, data.get('expires_in', 300) - TOKEN_EXPIRY_MARGIN)
+            with self.lock:
+                for name in batch:
+                    self.tokens[name] = (token, expires)
+
+    def _headers(self, name):
+        with self.lock:
+            token, expires = self.tokens.get(name, (None, 0))
+        if token is None or expires <= time.monotonic():
+            self.authorize([name])
+            with self.lock:
+                token = self.tokens.get(name, (None, 0))[0]
+        headers = {'Accept': MANIFEST_ACCEPT}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        return headers
+
+    def manifest_url(self, name, reference):
+        return f"{self.registry_url}/v2/{self._repository(name)}/manifests/{reference}"
+
+    def head_manifest(self, name, reference, limiter=None):
+        """Return (digest, media type) of a manifest, (None, None) if the tag does not exist"""
+        response = http_client.head(self.manifest_url(name, reference), headers=self._headers(name), limiter=limiter)
+        if response.status_code == 404:
+            return None, None
+        if response.status_code != 200:
+            raise requests.HTTPError(f"manifest HEAD returned status code {response.status_code}")
+        media_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        return response.headers.get('Docker-Content-Digest'), media_type
+
+    def get_manifest(self, name, digest, limiter=None):
+        """Fetch a manifest or index body by digest, through the content-addressed cache when there is one"""
+        if self.cache is not None:
+            return json.loads(self.cache.fetch(self, name, 'manifests', digest, limiter))
+        response = http_client.get(self.manifest_url(name, digest), headers=self._headers(name), limiter=limiter,
+                                   use_cache=False)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"manifest GET returned status code {response.status_code}")
+        return response.json()
+
+    def get_blob(self, name, kind, digest, limiter=None):
+        """Fetch the raw bytes of a manifest (`kind='manifests'`) or blob (`kind='blobs'`) by digest"""
+        url = f"{self.registry_url}/v2/{self._repository(name)}/{kind}/{digest}"
+        response = http_client.get(url, headers=self._headers(name), limiter=limiter, use_cache=False)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"{kind} GET of {digest} returned status code {response.status_code}")
+        return response.content
+
+    def digests(self, name, previous=None, limiter=None):
+        """Return {tag: {'digest', 'platforms'}} for the tracked tags, reusing unchanged index platforms"""
+        previous = previous or {}
+        digests = {}
+        for tag in self.tags:
+            try:
+                digest, media_type = self.head_manifest(name, tag, limiter)
+                if digest is None:
+                    continue
+                entry = {'digest': digest, 'platforms': {}}
+                if media_type in INDEX_MEDIA_TYPES:
+                    # An index digest pins its platform digests, so only a new index needs its body
+                    earlier = previous.get(tag) or {}
+                    if earlier.get('digest') == digest:
+                        entry['platforms'] = earlier.get('platforms', {})
+                    else:
+                        entry['platforms'] = index_platforms(self.get_manifest(name, digest, limiter))
+                digests[tag] = entry
+            except Exception as e:
+                # An unknown digest is not a change; keep the last known one
+                log_setup.request_log.warning("Could not read the %s manifest digest of %s: %s", tag, name, e)
+                if tag in previous:
+                    digests[tag] = previous[tag]
+        return digests
+
+def digest_changes(server_name, previous, current):
+    """Return one change per tracked tag whose digest differs from the previous run"""
+    changes = []
+    for tag, entry in (current or {}).items():
+        earlier = (previous or {}).get(tag)
+        if not earlier or earlier['digest'] == entry['digest']:
+            continue
+        platforms = sorted(
+            platform for platform in set(earlier.get('platforms', {})) | set(entry.get('platforms', {}))
+            if earlier.get('platforms', {}).get(platform) != entry.get('platforms', {}).get(platform)
+        )
+        changes.append({
+            'server': server_name,
+            'type': 'digest',
+            'tag': tag,
+            'previous': earlier['digest'],
+            'current': entry['digest'],
+            'platforms': platforms
+        })
+    return changes
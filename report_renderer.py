@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Streaming report renderer for check_mcp_servers.py.
+This module:
+1. Walks the server status and the detected changes once
+2. Streams every row to any number of sinks at the same time (stdout,
+   report files, the notification body)
+3. Supports text, Markdown, JSON, CSV and HTML sinks, each writing rows as
+   they arrive so memory stays flat regardless of catalog size
+4. Appends the catalog-wide image analysis when one was run
+"""
+
+import io
+import csv
+import json
+import html
+import argparse
+from datetime import datetime
+
+# Constants
+FORMATS = ('text', 'json', 'markdown', 'csv', 'html')
+STATUS_HEADERS = ["Name", "Status", "Version", "Last Updated", "Pull Count"]
+COLUMN_GAP = '  '
+
+def describe_change(change):
+    """Describe a change in plain text"""
+    if change['type'] == 'status':
+        return f"Status changed from {change['previous']} to {change['current']}"
+    if change['type'] == 'version':
+        return f"Version updated from {change['previous']} to {change['current']}"
+    if change['type'] == 'pull_count':
+        return f"Pull count changed by {change['percentage']}% ({change['previous']:,} ? {change['current']:,}){zscore_note(change)}"
+    if change['type'] == 'pull_trend':
+        return f"Daily pulls trending down by {abs(change['percentage'])}% ({change['previous']:,} ? {change['current']:,} per day)"
+    if change['type'] == 'digest':
+        platforms = f" on {', '.join(change['platforms'])}" if change['platforms'] else ''
+        return f"Image {change['tag']} rebuilt{platforms} ({short_digest(change['previous'])} ? {short_digest(change['current'])})"
+    if change['type'] == 'image_size':
+        return f"Image size grew by {change['percentage']}% ({format_size(change['previous'])} ? {format_size(change['current'])})"
+    if change['type'] == 'probe':
+        return f"MCP handshake changed from {change['previous']} to {change['current']}"
+    if change['type'] == 'startup_latency':
+        return f"Cold start slowed by {change['percentage']}% ({change['previous']:.2f}s ? {change['current']:.2f}s)"
+    if change['type'] == 'flapping':
+        return f"Status flapping ({change['transitions']} transitions, now {change['current']})"
+    if change['type'] == 'new':
+        return f"New server detected (Status: {change['status']})"
+    if change['type'] == 'removed':
+        return "Server removed"
+    return change['type']
+
+def short_digest(digest):
+    """Abbreviate a `sha256:` content digest for reports"""
+    algorithm, _, value = (digest or '').partition(':')
+    return f"{algorithm}:{value[:12]}" if value else digest
+
+def format_size(size):
+    """Format a byte count in megabytes"""
+    return f"{size / 1e6:,.1f} MB"
+
+def image_lines(summary):
+    """Plain-text lines of the catalog-wide image analysis"""
+    lines = [
+        f"{summary['images']} images, {format_size(summary['total_size'])} in total, "
+        f"{format_size(summary['deduplicated_size'])} with shared layers pulled once "
+        f"({summary['shared_layer_count']} shared layers)"
+    ]
+    for layer in summary['shared_layers']:
+        lines.append(f"Shared layer {short_digest(layer['digest'])}: {format_size(layer['size'])} in {layer['images']} images")
+    for image in summary['largest']:
+        lines.append(f"Largest image {image['server']}: {format_size(image['size'])}")
+    return lines
+
+def zscore_note(change):
+    """Suffix naming the z-score of a history-based pull count anomaly"""
+    return f", z-score {change['zscore']}" if 'zscore' in change else ''
+
+def text_cells(name, data):
+    """Cells of one server row in the text report"""
+    return [
+        name,
+        data['status'],
+        data['version'] or 'N/A',
+        data['last_updated'] or 'N/A',
+        f"{data['pull_count']:,}" if data['pull_count'] else 'N/A'
+    ]
+
+class Sink:
+    """Receives the report as a stream of events and writes one format to a stream"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def begin(self, timestamp, servers_status, changes):
+        pass
+
+    def row(self, name, data):
+        pass
+
+    def change(self, change):
+        pass
+
+    def images(self, summary):
+        pass
+
+    def end(self):
+        pass
+
+class TextSink(Sink):
+    """Plain-text report with an aligned status table"""
+
+    def begin(self, timestamp, servers_status, changes):
+        # Size the columns up front from string lengths only, so rows can be written as they arrive
+        self.widths = [len(header) for header in STATUS_HEADERS]
+        for name, data in servers_status.items():
+            for index, cell in enumerate(text_cells(name, data)):
+                self.widths[index] = max(self.widths[index], len(str(cell)))
+        self.listing = False
+        self.stream.write(f"SERVER CHECK REPORT - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.stream.write("\nSERVER STATUS:\n")
+        self._line(STATUS_HEADERS)
+        self._line(['-' * width for width in self.widths])
+
+    def _line(self, cells):
+        self.stream.write(COLUMN_GAP.join(str(cell).ljust(width) for cell, width in zip(cells, self.widths)).rstrip() + '\n')
+
+    def row(self, name, data):
+        self._line(text_cells(name, data))
+
+    def change(self, change):
+        if not self.listing:
+            self.stream.write("\nCHANGES DETECTED:\n")
+            self.listing = True
+        self.stream.write(f"- {change['server']}: {describe_change(change)}\n")
+
+    def images(self, summary):
+        self.stream.write("\nIMAGE ANALYSIS:\n")
+        for line in image_lines(summary):
+            self.stream.write(f"- {line}\n")
+
+class MarkdownSink(Sink):
+    """Markdown report, also used as the notification body"""
+
+    def begin(self, timestamp, servers_status, changes):
+        self.listing = False
+        self.stream.write("# MCP Server Check Report\n\n")
+        self.stream.write(f"Generated: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        self.stream.write("## Server Status\n\n")
+        self.stream.write("| Server | Status | Version | Last Updated | Pull Count |\n")
+        self.stream.write("|--------|--------|---------|--------------|------------|\n")
+
+    def row(self, name, data):
+        status_emoji = "?" if data['status'] == 'online' else "?" if data['status'] == 'offline' else "??"
+        self.stream.write(f"| {name} | {status_emoji} {data['status']} | {data['version'] or 'N/A'} | {data['last_updated'] or 'N/A'} | {data['pull_count']:,} |\n")
+
+    def change(self, change):
+        if not self.listing:
+            self.stream.write("\n## Changes Detected\n\n")
+            self.listing = True
+        if change['type'] == 'status':
+            line = f"Status changed from `{change['previous']}` to `{change['current']}`"
+        elif change['type'] == 'version':
+            line = f"Version updated from `{change['previous']}` to `{change['current']}`"
+        elif change['type'] == 'pull_count':
+            direction = "?" if change['percentage'] > 0 else "?"
+            line = f"Pull count changed by {direction} {abs(change['percentage'])}% ({change['previous']:,} ? {change['current']:,}){zscore_note(change)}"
+        elif change['type'] == 'new':
+            line = f"New server detected (Status: `{change['status']}`)"
+        else:
+            line = describe_change(change)
+        self.stream.write(f"- **{change['server']}**: {line}\n")
+
+    def images(self, summary):
+        self.stream.write("\n## Image Analysis\n\n")
+        self.stream.write(f"{image_lines(summary)[0]}\n\n")
+        if summary['shared_layers']:
+            self.stream.write("| Shared Layer | Size | Images |\n|--------------|------|--------|\n")
+            for layer in summary['shared_layers']:
+                self.stream.write(f"| `{short_digest(layer['digest'])}` | {format_size(layer['size'])} | {layer['images']} |\n")
+            self.stream.write("\n")
+        self.stream.write("| Largest Image | Size |\n|---------------|------|\n")
+        for image in summary['largest']:
+            self.stream.write(f"| {image['server']} | {format_size(image['size'])} |\n")
+
+class JsonSink(Sink):
+    """JSON document with the status, the changes and the report timestamp"""
+
+    def begin(self, timestamp, servers_status, changes):
+        self.timestamp = timestamp
+        self.summary = None
+        self.listing = False
+        self.first = True
+        self.stream.write('{\n  "status": {')
+
+    def _item(self, text):
+        self.stream.write(('\n' if self.first else ',\n') + '    ' + text.replace('\n', '\n    '))
+        self.first = False
+
+    def _close_section(self, closing):
+        self.stream.write(closing if self.first else f'\n  {closing}')
+
+    def row(self, name, data):
+        self._item(f"{json.dumps(name)}: {json.dumps(data, indent=2)}")
+
+    def _open_changes(self):
+        self._close_section('},\n  "changes": [')
+        self.listing = True
+        self.first = True
+
+    def change(self, change):
+        if not self.listing:
+            self._open_changes()
+        self._item(json.dumps(change, indent=2))
+
+    def images(self, summary):
+        self.summary = summary
+
+    def end(self):
+        if not self.listing:
+            self._open_changes()
+        self._close_section(']')
+        if self.summary is not None:
+            self.stream.write(',\n  "images": ' + json.dumps(self.summary, indent=2).replace('\n', '\n  '))
+        self.stream.write(f',\n  "timestamp": {json.dumps(self.timestamp.isoformat())}\n}}\n')
+
+class CsvSink(Sink):
+    """One CSV row per server with that server's changes, plus rows for removed servers"""
+
+    def begin(self, timestamp, servers_status, changes):
+        self.writer = csv.writer(self.stream, lineterminator='\n')
+        self.changes = {}
+        for change in changes:
+            self.changes.setdefault(change['server'], []).append(describe_change(change))
+        self.writer.writerow(['server', 'status', 'version', 'last_updated', 'pull_count', 'checked_at', 'changes'])
+
+    def row(self, name, data):
+        self.writer.writerow([
+            name, data['status'], data['version'] or '', data['last_updated'] or '',
+            data['pull_count'], data.get('timestamp', ''), '; '.join(self.changes.get(name, []))
+        ])
+
+    def change(self, change):
+        if change['type'] == 'removed':
+            self.writer.writerow([change['server'], 'removed', '', '', '', '', describe_change(change)])
+
+class HtmlSink(Sink):
+    """Standalone HTML page with the status table and a list of changes"""
+
+    def begin(self, timestamp, servers_status, changes):
+        self.listing = False
+        generated = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        self.stream.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n')
+        self.stream.write('<title>MCP Server Check Report</title>\n</head>\n<body>\n')
+        self.stream.write(f'<h1>MCP Server Check Report</h1>\n<p>Generated: {generated}</p>\n')
+        self.stream.write('<h2>Server Status</h2>\n<table>\n<thead>\n<tr>')
+        self.stream.write(''.join(f'<th>{header}</th>' for header in STATUS_HEADERS))
+        self.stream.write('</tr>\n</thead>\n<tbody>\n')
+
+    def row(self, name, data):
+        cells = text_cells(name, data)
+        self.stream.write(f'<tr class="{html.escape(data["status"])}">')
+        self.stream.write(''.join(f'<td>{html.escape(str(cell))}</td>' for cell in cells))
+        self.stream.write('</tr>\n')
+
+    def change(self, change):
+        if not self.listing:
+            self.stream.write('</tbody>\n</table>\n<h2>Changes Detected</h2>\n<ul>\n')
+            self.listing = True
+        self.stream.write(f'<li><strong>{html.escape(change["server"])}</strong>: {html.escape(describe_change(change))}</li>\n')
+
+    def _close(self):
+        if self.listing:
+            self.stream.write('</ul>\n')
+        else:
+            self.stream.write('</tbody>\n</table>\n')
+        self.listing = None
+
+    def images(self, summary):
+        self._close()
+        self.stream.write('<h2>Image Analysis</h2>\n<ul>\n')
+        self.stream.write(''.join(f'<li>{html.escape(line)}</li>\n' for line in image_lines(summary)))
+        self.stream.write('</ul>\n')
+
+    def end(self):
+        if self.listing is not None:
+            self._close()
+        self.stream.write('</body>\n</html>\n')
+
+SINKS = {
+    'text': TextSink,
+    'json': JsonSink,
+    'markdown': MarkdownSink,
+    'csv': CsvSink,
+    'html': HtmlSink
+}
+
+def make_sink(output_format, stream):
+    """Create a sink writing `output_format` to `stream`"""
+    return SINKS[output_format](stream)
+
+def render(servers_status, changes, sinks, timestamp=None, image_summary=None):
+    """Walk the status and changes once, streaming every event to all sinks"""
+    timestamp = timestamp or datetime.now()
+    for sink in sinks:
+        sink.begin(timestamp, servers_status, changes)
+    for name, data in servers_status.items():
+        for sink in sinks:
+            sink.row(name, data)
+    for change in changes:
+        for sink in sinks:
+            sink.change(change)
+    if image_summary:
+        for sink in sinks:
+            sink.images(image_summary)
+    for sink in sinks:
+        sink.end()
+
+def render_string(servers_status, changes, output_format='markdown'):
+    """Render a single format into a string"""
+    buffer = io.StringIO()
+    render(servers_status, changes, [make_sink(output_format, buffer)])
+    return buffer.getvalue()
+
+def parse_report_target(value):
+    """Parse a `FORMAT:PATH` report target for argparse"""
+    output_format, separator, path = value.partition(':')
+    if not separator or output_format not in SINKS or not path:
+        raise argparse.ArgumentTypeError(f"invalid report '{value}', expected FORMAT:PATH with FORMAT one of {', '.join(FORMATS)}")
+    return output_format, path
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache for the MCP server scripts.
+This module:
+1. Stores response bodies and their ETag/Last-Modified validators per URL in SQLite
+2. Serves entries younger than the TTL without touching the network
+3. Turns older entries into conditional requests so unchanged data costs a 304
+4. Evicts expired entries and the least recently used ones beyond a size budget
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Constants
+DEFAULT_CACHE_FILE = '.http_cache.db'
+DEFAULT_TTL = 60
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+'''
+
+class ResponseCache:
+    """SQLite-backed cache of GET responses keyed by URL"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl=DEFAULT_TTL, max_age=DEFAULT_MAX_AGE,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    def _lookup(self, url):
+        row = self.db.execute(
+            'SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE url = ?',
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'headers': json.loads(row[2]),
+            'body': row[3],
+            'stored_at': row[4]
+        }
+
+    def _store(self, url, response, now):
+        body = response.content
+        self.db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+             json.dumps(dict(response.headers)), body, len(body), now, now)
+        )
+        self.stats['stored'] += 1
+
+    def _touch(self, url, now, revalidated=False):
+        if revalidated:
+            self.db.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+        else:
+            self.db.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+
+    def get(self, url, send, headers=None):
+        """Serve a GET from the cache, calling `send(headers)` to revalidate or refetch"""
+        now = time.time()
+        with self.lock:
+            entry = self._lookup(url)
+            if entry and now - entry['stored_at'] < self.ttl:
+                self._touch(url, now)
+                self.stats['hits'] += 1
+                return _build_response(url, entry)
+
+        headers = dict(headers or {})
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = send(headers)
+
+        with self.lock:
+            if response.status_code == 304 and entry:
+                self._touch(url, now, revalidated=True)
+                self.db.commit()
+                self.stats['revalidated'] += 1
+                return _build_response(url, entry, response.headers)
+
+            self.stats['misses'] += 1
+            if response.status_code == 200:
+                self._store(url, response, now)
+                self.db.commit()
+        return response
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size budget"""
+        with self.lock:
+            cutoff = time.time() - self.max_age
+            evicted = self.db.execute('DELETE FROM responses WHERE accessed_at < ?', (cutoff,)).rowcount
+
+            total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total > self.max_bytes:
+                rows = self.db.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall()
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self.db.execute('DELETE FROM responses WHERE url = ?', (url,))
+                    total -= size
+                    evicted += 1
+
+            self.db.commit()
+            self.stats['evicted'] += evicted
+
+    def close(self):
+        """Evict, report statistics and close the database"""
+        self.evict()
+        logging.info(
+            f"HTTP cache: {self.stats['hits']} hits, {self.stats['revalidated']} revalidated, "
+            f"{self.stats['misses']} misses, {self.stats['evicted']} evicted"
+        )
+        with self.lock:
+            self.db.close()
+
+def _build_response(url, entry, headers=None):
+    """Rebuild a requests.Response from a cache entry"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    if headers:
+        response.headers.update({k: v for k, v in headers.items() if k.lower().startswith('x-ratelimit')})
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-server check scheduler for incremental scans.
+This module:
+1. Keeps a next-check time and check interval per server in server_schedule.json
+2. Shortens the interval of servers that just changed, and backs it off
+   exponentially for servers that stay stable, up to a ceiling that is lower
+   for servers that changed often recently
+3. Selects the servers that are due on each run, forcing a full sweep on a
+   configurable interval
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+
+# Constants
+SCHEDULE_FILE = 'server_schedule.json'
+MIN_CHECK_INTERVAL = 3600
+MAX_CHECK_INTERVAL = 3 * 24 * 3600
+BACKOFF_FACTOR = 2
+DEFAULT_FULL_SWEEP_HOURS = 7 * 24
+CHANGE_DECAY = 0.8
+TRACKED_CHANGES = ('status', 'flapping', 'version', 'digest', 'layers', 'image_size', 'probe', 'startup_latency',
+                   'pull_count', 'pull_trend', 'new')
+
+def load_schedule(path=SCHEDULE_FILE):
+    """Load the check schedule from file"""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+    except Exception as e:
+        logging.error(f"Error loading check schedule: {e}")
+    return {'last_full_sweep': None, 'servers': {}}
+
+def save_schedule(schedule, path=SCHEDULE_FILE):
+    """Save the check schedule to file"""
+    try:
+        # Write a temporary file and swap it in, so an interrupted run never truncates the schedule
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix='.server_schedule.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(schedule, file, indent=2)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        logging.info(f"Check schedule saved to {path}")
+    except Exception as e:
+        logging.error(f"Error saving check schedule: {e}")
+
+def select_due(servers, previous_status, schedule, full_sweep_hours=DEFAULT_FULL_SWEEP_HOURS, now=None):
+    """Return (servers due for a check, whether this run is a full sweep)"""
+    now = now or datetime.now()
+    last_full_sweep = schedule.get('last_full_sweep')
+    if not last_full_sweep or now - datetime.fromisoformat(last_full_sweep) >= timedelta(hours=full_sweep_hours):
+        logging.info("Full sweep due, checking every server")
+        return list(servers), True
+
+    entries = schedule.get('servers', {})
+    due = []
+    for server in servers:
+        name = server['server_name']
+        entry = entries.get(name)
+        if name not in previous_status or not entry or datetime.fromisoformat(entry['next_check']) <= now:
+            due.append(server)
+
+    logging.info(f"Incremental scan: {len(due)} of {len(servers)} servers due for a check")
+    return due, False
+
+def update_schedule(schedule, checked_names, changes, server_names, full_sweep=False, now=None):
+    """Reschedule the checked servers based on whether they just changed"""
+    now = now or datetime.now()
+    changed = {change['server'] for change in changes if change['type'] in TRACKED_CHANGES}
+    entries = schedule.setdefault('servers', {})
+
+    # Forget servers that are no longer listed in the README
+    for name in [name for name in entries if name not in server_names]:
+        del entries[name]
+
+    for name in checked_names:
+        entry = entries.get(name, {})
+        # A decaying count of recent changes; the more a server changed lately, the lower its interval ceiling
+        change_score = round(entry.get('change_score', 0) * CHANGE_DECAY + (1 if name in changed else 0), 3)
+        if name in changed or 'interval' not in entry:
+            interval = MIN_CHECK_INTERVAL
+        else:
+            ceiling = max(MIN_CHECK_INTERVAL, MAX_CHECK_INTERVAL / (1 + change_score))
+            interval = min(ceiling, entry['interval'] * BACKOFF_FACTOR)
+        entries[name] = {
+            'interval': interval,
+            'next_check': (now + timedelta(seconds=interval)).isoformat(),
+            'change_score': change_score
+        }
+
+    if full_sweep:
+        schedule['last_full_sweep'] = now.isoformat()
+    return schedule
+
+def merge_status(servers, checked_status, previous_status):
+    """Combine freshly checked servers with carried-over previous results, in README order"""
+    current_status = {}
+    for server in servers:
+        name = server['server_name']
+        if name in checked_status:
+            current_status[name] = checked_status[name]
+        elif name in previous_status:
+            current_status[name] = previous_status[name]
+    return current_status
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Prebuilt search index over the MCP server catalog.
+This module:
+1. Builds an inverted index and a trigram index over the vocabulary from the
+   parsed README server table; each term's postings are grouped by weight and
+   ranked by pull count, so the best matches of a term come first
+2. Rebuilds incrementally: only rows whose name, description, link or pull
+   count changed since the last build are re-indexed
+3. Answers ranked queries with prefix and typo-tolerant term matching,
+   ordered by relevance or by pull count; single-term queries merge the ranked
+   postings and stop after the requested number of results
+
+Usage:
+  python search_index.py build [--readme PATH] [--index PATH] [--full]
+  python search_index.py query TEXT [--sort relevance|pulls] [--limit N] [--json]
+"""
+
+import os
+import re
+import json
+import math
+import time
+import bisect
+import heapq
+import hashlib
+import argparse
+import logging
+import tempfile
+from collections import Counter
+from urllib.parse import urlsplit
+import catalog
+
+# Constants
+SEARCH_INDEX = 'search_index.json'
+INDEX_VERSION = 1
+FIELD_WEIGHTS = {'name': 3.0, 'description': 1.0, 'link': 0.5}
+PREFIX_QUALITY = 0.7
+FUZZY_QUALITY = 0.5
+NAME_MATCH_BONUS = 10.0
+MIN_PREFIX_LENGTH = 2
+MIN_TRIGRAM_SIMILARITY = 0.2
+DEFAULT_LIMIT = 10
+SORT_ORDERS = ('relevance', 'pulls')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+LINK_PATTERN = re.compile(r'\((https?://[^)\s]+)\)')
+
+def tokenize(text):
+    """Lowercase alphanumeric terms of `text`"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def trigrams(term):
+    """Trigrams of a term padded with a boundary space on each side"""
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def parse_pulls(cell):
+    """Pull count of a README cell such as `1,234`, or 0 when it is not a number"""
+    digits = cell.replace(',', '').strip()
+    return int(digits) if digits.isdigit() else 0
+
+def link_url(cell):
+    """URL of a Markdown link cell, or the cell itself"""
+    match = LINK_PATTERN.search(cell)
+    return match.group(1) if match else cell
+
+def make_document(server):
+    """Indexed fields of one parsed README row, with a digest of their content"""
+    document = {
+        'description': server['description'],
+        'link': link_url(server['link']),
+        'pulls': parse_pulls(server['pull_count'])
+    }
+    content = '\0'.join([server['server_name'], document['description'], document['link'], str(document['pulls'])])
+    document['digest'] = hashlib.sha1(content.encode('utf-8')).hexdigest()
+    return document
+
+def document_terms(name, document):
+    """Weighted terms of a document: every field's terms times the field weight"""
+    weights = Counter()
+    fields = {
+        'name': name,
+        'description': document['description'],
+        'link': urlsplit(document['link']).path
+    }
+    for field, text in fields.items():
+        for term in tokenize(text):
+            weights[term] += FIELD_WEIGHTS[field]
+    return weights
+
+def empty_index():
+    return {'version': INDEX_VERSION, 'documents': {}, 'terms': {}, 'trigrams': {}}
+
+def _remove_document(index, name):
+    document = index['documents'].pop(name)
+    for term, weight in document_terms(name, document).items():
+        groups = index['terms'][term]
+        groups[str(weight)].remove(name)
+        if not groups[str(weight)]:
+            del groups[str(weight)]
+        if not groups:
+            # The term left the vocabulary, so it leaves the trigram index too
+            del index['terms'][term]
+            for trigram in trigrams(term):
+                terms = index['trigrams'][trigram]
+                terms.remove(term)
+                if not terms:
+                    del index['trigrams'][trigram]
+
+def _add_document(index, name, document, touched):
+    index['documents'][name] = document
+    for term, weight in document_terms(name, document).items():
+        if term not in index['terms']:
+            index['terms'][term] = {}
+            for trigram in trigrams(term):
+                bisect.insort(index['trigrams'].setdefault(trigram, []), term)
+        group = index['terms'][term].setdefault(str(weight), [])
+        group.append(name)
+        touched[id(group)] = group
+
+def build_index(servers, previous=None):
+    """Return the index of `servers`, updating `previous` in place for rows that changed; also return the counts"""
+    index = previous if previous and previous.get('version') == INDEX_VERSION else empty_index()
+    documents = {server['server_name']: make_document(server) for server in servers}
+    stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    touched = {}
+
+    for name in [name for name in index['documents'] if name not in documents]:
+        _remove_document(index, name)
+        stats['removed'] += 1
+    for name, document in documents.items():
+        earlier = index['documents'].get(name)
+        if earlier is not None and earlier['digest'] == document['digest']:
+            stats['unchanged'] += 1
+            continue
+        if earlier is not None:
+            _remove_document(index, name)
+        _add_document(index, name, document, touched)
+        stats['updated' if earlier is not None else 'added'] += 1
+
+    # Only the posting groups that received servers need re-ranking by pull count
+    for group in touched.values():
+        group.sort(key=lambda name: (-index['documents'][name]['pulls'], name))
+    return index, stats
+
+def load_index(path=SEARCH_INDEX):
+    """Load an index file, or return None when there is none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+def save_index(index, path=SEARCH_INDEX):
+    """Write the index compactly to a temporary file and rename it into place"""
+    fd, temp_path = tempfile.mkstemp(prefix='.search_index.', dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump(index, file, separators=(',', ':'), sort_keys=True)
+    os.replace(temp_path, path)
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance of `a` and `b`, or `limit + 1` once it exceeds `limit`"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class Searcher:
+    """Ranked queries over a loaded index"""
+
+    def __init__(self, index):
+        self.index = index
+        self.vocabulary = sorted(index['terms'])
+        self.names = {name.lower(): name for name in index['documents']}
+
+    def expand(self, query_term):
+        """Vocabulary terms matching a query term, with the quality of each match"""
+        terms = self.index['terms']
+        matches = {}
+        if query_term in terms:
+            matches[query_term] = 1.0
+        if len(query_term) >= MIN_PREFIX_LENGTH:
+            position = bisect.bisect_left(self.vocabulary, query_term)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(query_term):
+                matches.setdefault(self.vocabulary[position], PREFIX_QUALITY)
+                position += 1
+        if matches:
+            return matches
+
+        # No exact or prefix match: look for terms within a small edit distance
+        query_trigrams = trigrams(query_term)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.index['trigrams'].get(trigram, ()))
+        limit = 1 if len(query_term) <= 5 else 2
+        for term, count in shared.items():
+            if count / len(query_trigrams | trigrams(term)) < MIN_TRIGRAM_SIMILARITY:
+                continue
+            distance = edit_distance(query_term, term, limit)
+            if distance <= limit:
+                matches[term] = FUZZY_QUALITY / distance
+        return matches
+
+    def postings(self, term):
+        return sum(len(names) for names in self.index['terms'][term].values())
+
+    def idf(self, term):
+        return math.log(1 + len(self.index['documents']) / self.postings(term))
+
+    def sort_key(self, name, score, sort):
+        pulls = self.index['documents'][name]['pulls']
+        return (-pulls, -score, name) if sort == 'pulls' else (-score, -pulls, name)
+
+    def score(self, name, expansions):
+        """Score of one server against every query term's weighted expansion, or None if a term does not match it"""
+        weights = document_terms(name, self.index['documents'][name])
+        total = 0.0
+        for expansion in expansions:
+            best = max((weights[term] * factor for term, factor in expansion.items() if term in weights), default=None)
+            if best is None:
+                return None
+            total += best
+        return total
+
+    def top(self, expansion, sort, limit):
+        """Best servers of a single query term, merged lazily from its ranked posting groups"""
+        def stream(names, score):
+            for name in names:
+                yield self.sort_key(name, score, sort), name, score
+
+        streams = []
+        for term, factor in expansion.items():
+            for weight, names in self.index['terms'][term].items():
+                streams.append(stream(names, float(weight) * factor))
+
+        # A server in several groups is first met with its best score
+        ranked = {}
+        for _, name, score in heapq.merge(*streams):
+            if name not in ranked:
+                ranked[name] = score
+                if len(ranked) == limit:
+                    break
+        return list(ranked.items())
+
+    def search(self, text, sort='relevance', limit=DEFAULT_LIMIT):
+        """Return the servers matching every query term, best first"""
+        documents = self.index['documents']
+        expansions = [self.expand(query_term) for query_term in dict.fromkeys(tokenize(text))]
+        if not expansions or not all(expansions):
+            return []
+        # Weigh every matched term by its match quality and its rarity
+        expansions = [{term: quality * self.idf(term) for term, quality in expansion.items()} for expansion in expansions]
+
+        if len(expansions) == 1:
+            ranked = self.top(expansions[0], sort, limit + 1)
+        else:
+            # Score the servers of the most selective query term against all the others
+            rarest = min(expansions, key=lambda expansion: sum(self.postings(term) for term in expansion))
+            candidates = {name for term in rarest for names in self.index['terms'][term].values() for name in names}
+            scored = ((name, self.score(name, expansions)) for name in candidates)
+            ranked = heapq.nsmallest(limit + 1, ((name, score) for name, score in scored if score is not None),
+                                     key=lambda item: self.sort_key(item[0], item[1], sort))
+
+        # A query that spells a server name puts that server first
+        exact = self.names.get(text.strip().lower())
+        if sort == 'relevance' and exact is not None:
+            score = self.score(exact, expansions)
+            if score is not None:
+                ranked = [(exact, score + NAME_MATCH_BONUS)] + [item for item in ranked if item[0] != exact]
+
+        return [
+            {'name': name, 'score': round(score, 3), 'pulls': documents[name]['pulls'],
+             'description': documents[name]['description'], 'link': documents[name]['link']}
+            for name, score in ranked[:limit]
+        ]
+
+def build(readme_path=catalog.README_PATH, index_path=SEARCH_INDEX, full=False):
+    """Build or incrementally update the index file from the README server table"""
+    servers = catalog.find_all_mcp_servers(catalog.read_readme(readme_path))
+    previous = None if full else load_index(index_path)
+    index, stats = build_index(servers, previous)
+    if previous is not None and not (stats['added'] or stats['updated'] or stats['removed']):
+        logging.info(f"{index_path} is up to date ({stats['unchanged']} servers)")
+        return index
+    save_index(index, index_path)
+    logging.info(f"Indexed {len(index['documents'])} servers in {index_path}: {stats['added']} added, "
+                 f"{stats['updated']} updated, {stats['removed']} removed, {stats['unchanged']} unchanged")
+    return index
+
+def main():
+    """Build the search index or query it from the command line"""
+    parser = argparse.ArgumentParser(description='Build and query the MCP server search index')
+    parser.add_argument('--index', default=SEARCH_INDEX, help=f'Index file (default: {SEARCH_INDEX})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Index the README server table, re-indexing changed rows only')
+    build_parser.add_argument('--readme', default=catalog.README_PATH)
+    build_parser.add_argument('--full', action='store_true', help='Rebuild the index from scratch')
+
+    query_parser = subparsers.add_parser('query', help='Print the servers matching a query')
+    query_parser.add_argument('text')
+    query_parser.add_argument('--readme', default=catalog.README_PATH,
+                              help='README indexed first when the index file does not exist yet')
+    query_parser.add_argument('--sort', choices=SORT_ORDERS, default='relevance')
+    query_parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT)
+    query_parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'build':
+        build(args.readme, args.index, args.full)
+        return
+
+    index = load_index(args.index) or build(args.readme, args.index)
+    searcher = Searcher(index)
+    start = time.perf_counter()
+    results = searcher.search(args.text, args.sort, args.limit)
+    logging.info(f"{len(results)} results in {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"{result['name']:<40} {result['pulls']:>12,}  {result['description']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Sharded execution helpers for the MCP server scripts.
+This module:
+1. Parses `--shard i/n` and assigns every server to a shard by a stable hash
+   of its name, so each runner picks the same partition on every run
+2. Writes each shard's partial results to its own file
+3. Loads a complete set of partial results for the merge step
+4. Fingerprints the input files, so the merge can refuse shards that ran on
+   different inputs
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import argparse
+import tempfile
+
+def parse_shard(value):
+    """Parse an `i/n` shard specification (1 <= i <= n) for argparse"""
+    try:
+        index, total = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}', expected i/n")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}', expected 1 <= i <= n")
+    return index, total
+
+def shard_of(server_name, total):
+    """Return the 1-based shard a server belongs to"""
+    return zlib.crc32(server_name.encode('utf-8')) % total + 1
+
+def select_shard(servers, shard):
+    """Return the servers that belong to `shard`, keeping their order"""
+    index, total = shard
+    return [server for server in servers if shard_of(server['server_name'], total) == index]
+
+def partial_path(prefix, shard):
+    """Default partial result file for a shard"""
+    index, total = shard
+    return f"{prefix}.shard-{index}-of-{total}.json"
+
+def write_partial(path, shard, payload):
+    """Atomically write a shard's partial results"""
+    index, total = shard
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.shard.', suffix='.tmp', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump({'shard': index, 'total': total, **payload}, file)
+    os.replace(temp_path, path)
+
+def file_sha256(path):
+    """Return the SHA-256 of a file's contents, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_partials(paths):
+    """Load partial results, checking that they cover every shard exactly once"""
+    partials = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            partials.append(json.load(file))
+
+    totals = {partial['total'] for partial in partials}
+    if len(totals) != 1:
+        raise ValueError(f"Partial results come from different shard counts: {sorted(totals)}")
+    total = totals.pop()
+    shards = sorted(partial['shard'] for partial in partials)
+    if shards != list(range(1, total + 1)):
+        raise ValueError(f"Expected partial results for shards 1..{total}, got {shards}")
+
+    return sorted(partials, key=lambda partial: partial['shard'])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Local HTTP status endpoint for the check_mcp_servers.py daemon mode.
+This module serves the daemon's in-memory results, so dashboards can poll
+them without triggering any Docker Hub traffic:
+1. GET /status   latest status of every server
+2. GET /changes  changes detected by recent check cycles
+3. GET /metrics  run metrics in the Prometheus text format
+4. GET /healthz  liveness probe
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import metrics
+
+# Constants
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+CHANGE_CYCLES_KEPT = 100
+
+_lock = threading.Lock()
+_status_body = b'{}'
+_changes = deque(maxlen=CHANGE_CYCLES_KEPT)
+_changes_body = b'[]'
+
+def publish(current_status, changes):
+    """Replace the served snapshot with the results of a check cycle"""
+    global _status_body, _changes_body
+    timestamp = datetime.now().isoformat()
+    status_body = json.dumps({'timestamp': timestamp, 'status': current_status}).encode()
+    with _lock:
+        if changes:
+            _changes.append({'timestamp': timestamp, 'changes': changes})
+            _changes_body = json.dumps(list(_changes)).encode()
+        _status_body = status_body
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Serves the pre-serialised daemon snapshot"""
+
+    def log_message(self, format, *args):
+        logging.debug(f"Status endpoint: {format % args}")
+
+    def _send(self, body, content_type='application/json'):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path == '/status':
+            with _lock:
+                body = _status_body
+            self._send(body)
+        elif path == '/changes':
+            with _lock:
+                body = _changes_body
+            self._send(body)
+        elif path == '/metrics':
+            self._send(metrics.render_prometheus().encode(), 'text/plain; version=0.0.4')
+        elif path == '/healthz':
+            self._send(b'ok', 'text/plain')
+        else:
+            self.send_error(404)
+
+def start(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve the status endpoints on a background thread"""
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logging.info(f"Status endpoint listening on http://{host}:{server.server_address[1]}")
+    return server
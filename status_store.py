@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Streaming, atomic persistence of MCP server status records.
+This module:
+1. Stores one JSON record per line, with the server name as the first key,
+   so records can be streamed and a subset of servers loaded without parsing
+   every record
+2. Writes to a temporary file and renames it into place, so a crash
+   mid-write never leaves a truncated status file behind
+3. Migrates the legacy single-document server_status.json layout
+"""
+
+import os
+import json
+import logging
+import tempfile
+
+# Constants
+STATUS_FILE = 'server_status.jsonl'
+LEGACY_STATUS_FILE = 'server_status.json'
+NAME_PREFIX = '{"name":'
+
+_decoder = json.JSONDecoder()
+
+def iter_status(path=STATUS_FILE, names=None):
+    """Yield (server name, status record) pairs one line at a time; with `names`, only parse the records of those servers"""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            # Every record starts with its name, so other servers' lines are skipped after decoding just the name
+            if names is not None and line.startswith(NAME_PREFIX):
+                name, _ = _decoder.raw_decode(line, len(NAME_PREFIX))
+                if name not in names:
+                    continue
+            record = json.loads(line)
+            if names is None or record['name'] in names:
+                yield record['name'], record
+
+def load_status(path=STATUS_FILE, names=None):
+    """Load the status records, or only those of `names`, into a dict keyed by server name"""
+    return dict(iter_status(path, names))
+
+def write_status(records, path=STATUS_FILE):
+    """Atomically replace the status file with `(name, record)` pairs, streaming them to disk"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.server_status.', suffix='.tmp', dir=directory)
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            for name, record in records:
+                record = {'name': name, **{key: value for key, value in record.items() if key != 'name'}}
+                file.write(json.dumps(record, separators=(',', ':')))
+                file.write('\n')
+                count += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return count
+
+def migrate_legacy(legacy_path=LEGACY_STATUS_FILE, path=STATUS_FILE):
+    """Convert a legacy server_status.json document to the line-delimited format"""
+    if os.path.exists(path) or not os.path.exists(legacy_path):
+        return False
+
+    with open(legacy_path, 'r', encoding='utf-8') as file:
+        legacy = json.load(file)
+    count = write_status(legacy.items(), path)
+    os.remove(legacy_path)
+    logging.info(f"Migrated {count} records from {legacy_path} to {path}")
+    return True
@@ -3,142 +3,49 @@
 Script to update Docker Hub pull counts for MCP servers listed in the README.md file.
 This script:
 1. Fetches the current list of servers from README.md
-2. Queries Docker Hub API to get the current pull count for each server
+2. Fetches each server's Docker Hub repository once to get its current pull count
 3. Updates the README.md with the latest pull counts
-4. Optionally commits and pushes the changes to GitHub
+4. Optionally commits and pushes the changed files to GitHub as one commit
 
 Usage:
-  python update_pull_counts.py [--commit]
+  python update_pull_counts.py [--commit] [--bulk]
+  python update_pull_counts.py --shard I/N [--bulk]
+  python update_pull_counts.py --merge PARTIAL... [--commit]
 
 Options:
-  --commit    Commit and push changes to GitHub
+  --commit           Commit and push changed files to GitHub as one commit
+  --publish-file F   Also publish file F with --commit (repeatable)
+  --bulk             Use the paginated namespace listing instead of one request per server
+  --concurrency N    Number of repositories fetched in parallel [default: 8]
+  --rate RPS         Maximum Docker Hub requests per second [default: 5]
+  --shard I/N        Only fetch pull counts for shard I of N and write its partial results
+  --merge FILE...    Combine all shards' partial results and update README.md once
+  --log-file PATH    Also write a JSON-lines log file, rotated by size
+  --log-sample L=R   Keep only fraction R of the per-request messages at level L
 """
 
 import os
-import re
-import time
-import base64
+import hashlib
 import argparse
-import requests
+import catalog
+import github_publisher
+import http_client
+import log_setup
+import metrics
+import sharding
 from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
 # Constants
-README_PATH = 'README.md'
-DOCKER_HUB_API_URL = 'https://hub.docker.com/v2/repositories/mcp/'
+README_PATH = catalog.README_PATH
+DOCKER_HUB_API_URL = catalog.DOCKER_HUB_API_URL
 GITHUB_REPO_URL = 'https://api.github.com/repos/ajeetraina/awesome-docker-mcp-servers'
-TABLE_PATTERN = r'\|\s*(\d+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|\s*([^\|]+)\s*\|'
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
+GITHUB_BRANCH = os.environ.get('GITHUB_BRANCH', github_publisher.DEFAULT_BRANCH)
+SHARD_PREFIX = 'pull_counts'
 
-def read_readme():
-    """Read the README.md file"""
-    try:
-        with open(README_PATH, 'r', encoding='utf-8') as file:
-            return file.read()
-    except FileNotFoundError:
-        logging.error(f"README file not found at {README_PATH}")
-        raise
-
-def extract_server_list(readme_content):
-    """Extract the server list from the README.md content"""
-    servers = []
-    
-    # First check how many servers are listed in the README
-    match = re.search(r'There are currently (\d+) MCP servers available:', readme_content)
-    expected_count = int(match.group(1)) if match else 0
-    
-    if expected_count > 0:
-        logging.info(f"README mentions {expected_count} MCP servers")
-    
-    # Find all table rows using regex pattern
-    matches = re.finditer(TABLE_PATTERN, readme_content)
-    
-    for match in matches:
-        index = match.group(1)
-        server_name = match.group(2).strip()
-        description = match.group(3).strip()
-        pull_count = match.group(4).strip()
-        link = match.group(5).strip()
-        
-        servers.append({
-            'index': index,
-            'server_name': server_name,
-            'description': description,
-            'pull_count': pull_count,
-            'link': link,
-            'line': match.group(0)
-        })
-    
-    # Verify if we found all servers
-    found_count = len(servers)
-    logging.info(f"Found {found_count} servers in README.md table")
-    
-    if expected_count > 0 and found_count < expected_count:
-        logging.warning(f"Expected {expected_count} servers but only found {found_count}")
-        logging.warning("Some servers might be missing from the table or in a different format")
-    
-    return servers
-
-def get_docker_hub_pull_count(server_name):
-    """Query Docker Hub API to get the pull count for a server"""
-    # Remove any leading/trailing whitespace
-    server_name = server_name.strip()
-    
-    try:
-        # Some server names might contain characters that need to be handled
-        url = f"{DOCKER_HUB_API_URL}{server_name}"
-        logging.info(f"Querying Docker Hub for {server_name} at URL: {url}")
-        
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            pull_count = data.get('pull_count', 0)
-            logging.info(f"Pull count for {server_name}: {pull_count}")
-            return f"{pull_count:,}"  # Format with comma separators
-        else:
-            logging.warning(f"Failed to get pull count for {server_name}: HTTP {response.status_code}")
-            return "TBD"
-    except Exception as e:
-        logging.error(f"Error getting pull count for {server_name}: {e}")
-        return "TBD"
-    
-    # Sleep to avoid rate limiting
-    time.sleep(1)
-
-def update_readme_with_pull_counts(readme_content, servers):
-    """Update the README.md with the latest pull counts"""
-    updated_content = readme_content
-    
-    for server in servers:
-        if server['pull_count'] != server.get('new_pull_count', server['pull_count']):
-            # Create the new line with updated pull count
-            old_line = server['line']
-            new_line = f"| {server['index']} | {server['server_name']} | {server['description']} | {server['new_pull_count']} | {server['link']} |"
-            
-            # Replace the old line with the new line
-            updated_content = updated_content.replace(old_line, new_line)
-            logging.info(f"Updated pull count for {server['server_name']}: {server['pull_count']} ? {server['new_pull_count']}")
-    
-    return updated_content
-
-def write_readme(content):
-    """Write the updated content back to README.md"""
-    try:
-        with open(README_PATH, 'w', encoding='utf-8') as file:
-            file.write(content)
-        logging.info(f"Successfully updated {README_PATH}")
-    except Exception as e:
-        logging.error(f"Failed to write to {README_PATH}: {e}")
-        raise
-
-def commit_and_push_changes():
-    """Commit and push the changes to GitHub"""
+def commit_and_push_changes(paths=(README_PATH,)):
+    """Commit and push the changed files to GitHub as a single commit"""
     if not GITHUB_TOKEN:
         logging.error("GITHUB_TOKEN environment variable not set. Cannot commit changes.")
         return False
@@ -147,138 +54,122 @@ def commit_and_push_changes():
     commit_message = f"Update Docker Hub pull counts - {date_str}"
     
     try:
-        # Using GitHub API to commit changes
-        headers = {
-            'Authorization': f'token {GITHUB_TOKEN}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
-        # 1. Get the current README content from GitHub
-        readme_response = requests.get(f"{GITHUB_REPO_URL}/contents/{README_PATH}", headers=headers)
-        readme_data = readme_response.json()
-        sha = readme_data['sha']
-        
-        # 2. Read the locally updated README
-        with open(README_PATH, 'r', encoding='utf-8') as file:
-            updated_content = file.read()
-        
-        # 3. Update the file on GitHub
-        update_data = {
-            'message': commit_message,
-            'content': base64.b64encode(updated_content.encode()).decode(),
-            'sha': sha,
-            'branch': 'main'
-        }
-        
-        update_response = requests.put(
-            f"{GITHUB_REPO_URL}/contents/{README_PATH}",
-            json=update_data,
-            headers=headers
-        )
-        
-        if update_response.status_code in (200, 201):
-            logging.info("Successfully committed and pushed changes to GitHub")
-            return True
-        else:
-            logging.error(f"Failed to push changes to GitHub: {update_response.status_code} - {update_response.text}")
-            return False
+        # Read every output locally; unchanged files are skipped by comparing blob hashes
+        files = {}
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as file:
+                files[path] = file.read()
+        
+        github_publisher.publish(GITHUB_REPO_URL, GITHUB_TOKEN, files, commit_message, GITHUB_BRANCH)
+        return True
             
     except Exception as e:
         logging.error(f"Error committing changes: {e}")
         return False
 
-def check_server_availability(servers):
-    """Check if the servers in the list are available"""
-    logging.info("Checking server availability...")
-    
-    for server in servers:
-        server_name = server['server_name'].strip()
-        try:
-            url = f"https://hub.docker.com/r/mcp/{server_name}"
-            response = requests.head(url)
-            if response.status_code == 200:
-                server['available'] = True
-                logging.info(f"Server {server_name} is available")
-            else:
-                server['available'] = False
-                logging.warning(f"Server {server_name} returned status code {response.status_code}")
-        except Exception as e:
-            server['available'] = False
-            logging.error(f"Error checking server {server_name}: {e}")
-        
-        # Sleep to avoid rate limiting
-        time.sleep(1)
-    
-    return servers
+def fetch_pull_counts(args, servers, catalog_servers=None):
+    """Set `new_pull_count` on each server from one fetch of its Docker Hub repository"""
+    # The shared catalog engine requests each repository once (or takes it from the namespace
+    # listing in bulk mode); a missing repository means the server is unavailable
+    with metrics.phase('pull_counts'):
+        results = catalog.fetch_catalog(servers, DOCKER_HUB_API_URL, args.concurrency, args.rate, args.bulk,
+                                        catalog=catalog_servers, versions=False)
+    
+    # Keep the README's current count when Docker Hub could not answer
+    catalog.apply_pull_counts(servers, results)
 
-def find_all_mcp_servers(readme_content):
-    """Find all MCP servers mentioned in the README, even those not in the main table"""
-    # First, get the servers from the main table
-    table_servers = extract_server_list(readme_content)
-    
-    # Then look for other MCP servers in the document
-    # This would need to be customized based on how the other servers are listed
-    
-    # Get additional servers from the README using a different pattern if needed
-    # For example, scanning for links to MCP server pages:
-    additional_servers = []
-    
-    # Combine and deduplicate the lists
-    all_servers = table_servers + additional_servers
-    
-    # Remove duplicates if any
-    server_names = set()
-    unique_servers = []
-    
-    for server in all_servers:
-        if server['server_name'] not in server_names:
-            server_names.add(server['server_name'])
-            unique_servers.append(server)
-    
-    logging.info(f"Found a total of {len(unique_servers)} unique MCP servers")
-    return unique_servers
+def merge_pull_counts(paths, readme_content, servers):
+    """Apply the pull counts from every shard's partial results to the parsed servers"""
+    partials = sharding.load_partials(paths)
+    readme_hash = hashlib.sha256(readme_content.encode('utf-8')).hexdigest()
+    if any(partial['readme_sha256'] != readme_hash for partial in partials):
+        raise ValueError("README.md changed since the shards ran; re-run the shards before merging")
+    
+    pull_counts = {}
+    for partial in partials:
+        pull_counts.update(partial['pull_counts'])
+    for server in servers:
+        server['new_pull_count'] = pull_counts.get(str(server['span'][0]), catalog.UNAVAILABLE_PULL_COUNT)
+    logging.info(f"Merged {len(pull_counts)} pull counts from {len(partials)} shards")
 
 def main():
     """Main function to update pull counts"""
     parser = argparse.ArgumentParser(description='Update Docker Hub pull counts for MCP servers')
     parser.add_argument('--commit', action='store_true', help='Commit and push changes to GitHub')
+    parser.add_argument('--publish-file', action='append', metavar='PATH',
+                        help='Also publish this file (e.g. a status or report file) in the same commit; repeatable')
     parser.add_argument('--full-scan', action='store_true', help='Scan the entire README for servers, not just the table')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Fetch pull counts from one paginated namespace listing instead of per server')
+    parser.add_argument('--concurrency', type=int, default=catalog.DEFAULT_CONCURRENCY,
+                        help=f'Number of repositories fetched in parallel (default: {catalog.DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=http_client.parse_rate, default=catalog.DEFAULT_RATE,
+                        help=f'Maximum Docker Hub requests per second (default: {catalog.DEFAULT_RATE:g})')
+    parser.add_argument('--shard', type=sharding.parse_shard, metavar='I/N',
+                        help='Only fetch pull counts for shard I of N and write them for a later --merge')
+    parser.add_argument('--partial', metavar='FILE',
+                        help=f'Partial results file written by --shard (default: {SHARD_PREFIX}.shard-I-of-N.json)')
+    parser.add_argument('--merge', nargs='+', metavar='FILE',
+                        help='Combine the pull counts of every shard and update README.md as a single run')
+    http_client.add_cache_arguments(parser)
+    http_client.add_cassette_arguments(parser)
+    
+    metrics.add_arguments(parser, 'pull_counts')
+    log_setup.add_arguments(parser)
     
     args = parser.parse_args()
+    if args.shard and args.merge:
+        parser.error('--shard and --merge are mutually exclusive')
     
+    log_setup.configure_from_args(args)
     logging.info("Starting Docker Hub pull count update process")
+    metrics.start(args, 'update_pull_counts')
+    http_client.enable_cache_from_args(args)
+    http_client.enable_cassette_from_args(args)
+    http_client.configure(pool_maxsize=max(args.concurrency, http_client.POOL_MAXSIZE))
     
     try:
-        # Read the README.md content
-        readme_content = read_readme()
-        
-        # Extract server list
-        if args.full_scan:
-            servers = find_all_mcp_servers(readme_content)
-        else:
-            servers = extract_server_list(readme_content)
+        with metrics.phase('readme'):
+            # Read the README.md content
+            readme_content = catalog.read_readme(README_PATH)
+            
+            # Extract server list
+            if args.full_scan:
+                servers = catalog.find_all_mcp_servers(readme_content)
+            else:
+                servers = catalog.extract_server_list(readme_content)
         
         logging.info(f"Found {len(servers)} servers in README.md")
         
-        # Check server availability
-        servers = check_server_availability(servers)
-        
-        # Update pull counts
-        for server in servers:
-            if server.get('available', False):
-                server['new_pull_count'] = get_docker_hub_pull_count(server['server_name'])
-            else:
-                server['new_pull_count'] = "TBD (unavailable)"
-        
-        # Update README.md with new pull counts
-        updated_content = update_readme_with_pull_counts(readme_content, servers)
+        if args.shard:
+            # Only fetch this shard's pull counts and leave the README to the merge step
+            shard_servers = sharding.select_shard(servers, args.shard)
+            logging.info(f"Shard {args.shard[0]}/{args.shard[1]}: updating {len(shard_servers)} of {len(servers)} servers")
+            fetch_pull_counts(args, shard_servers, servers)
+            path = args.partial or sharding.partial_path(SHARD_PREFIX, args.shard)
+            sharding.write_partial(path, args.shard, {
+                'readme_sha256': hashlib.sha256(readme_content.encode('utf-8')).hexdigest(),
+                'pull_counts': {str(server['span'][0]): server['new_pull_count'] for server in shard_servers}
+            })
+            logging.info(f"Shard results written to {path}")
+            return
+        
+        if args.merge:
+            merge_pull_counts(args.merge, readme_content, servers)
+        else:
+            fetch_pull_counts(args, servers)
         
-        # Write the updated content back to README.md
-        write_readme(updated_content)
+        with metrics.phase('render'):
+            # Update README.md with new pull counts
+            updated_content = catalog.update_readme_with_pull_counts(readme_content, servers)
+            
+            # Write the updated content back to README.md
+            catalog.write_readme(updated_content, readme_content, README_PATH)
         
         # Commit and push changes if --commit flag is provided
         if args.commit:
-            success = commit_and_push_changes()
+            with metrics.phase('github_push'):
+                success = commit_and_push_changes([README_PATH] + (args.publish_file or []))
             if success:
                 logging.info("Changes committed and pushed to GitHub")
             else:
@@ -289,6 +180,10 @@ def main():
     except Exception as e:
         logging.error(f"Error updating pull counts: {e}")
         raise
+    finally:
+        metrics.finish(args)
+        http_client.close_cassette()
+        http_client.disable_cache()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file